@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 import logging
 from app.services.firestore_helpers import normalise_timestamp
@@ -25,9 +25,9 @@ class Bucket:
 
     @classmethod
     def from_dict(cls, data: dict) -> "Bucket":
-        # Filter out unexpected fields to prevent errors
-        bucket_fields = {f.name for f in cls.__dataclass_fields__.values()}  # type: ignore[attr-defined]
-        filtered_data = {k: v for k, v in data.items() if k in bucket_fields}
+        # Pick known fields only; walking the short field list beats scanning
+        # every stored key, and absent fields keep their dataclass defaults.
+        filtered_data = {name: data[name] for name in _FIELD_NAMES if name in data}
 
         # Normalize date fields
         for date_field in ["createdAt", "updatedAt"]:
@@ -43,3 +43,6 @@ class Bucket:
                 filtered_data[date_field] = normalised
 
         return cls(**filtered_data)
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(Bucket))
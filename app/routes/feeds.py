@@ -65,6 +65,16 @@ def _render_index_building_response(
     return response
 
 
+@bp.after_request
+@public_bp.after_request
+def _apply_conditional_get(response: Response) -> Response:
+    # Runs after @cache.cached, so feeds served from the cache still answer a
+    # matching If-None-Match with 304, and only full 200s are ever cached.
+    if response.status_code == 200 and "ETag" in response.headers:
+        response.make_conditional(request)
+    return response
+
+
 @bp.route("/")
 def feed_list():
     """List publicly discoverable bucket feeds."""
@@ -101,13 +111,9 @@ def _render_bucket_feed(bucket_slug: str, *, require_audio: bool) -> Response:
             require_audio=require_audio,
         )
 
-        etag = hashlib.sha1(feed_xml).hexdigest()
-        if request.headers.get("If-None-Match") == etag:
-            return Response(status=304)
-
         resp = Response(feed_xml, mimetype=RSS_MIMETYPE)
         resp.headers["Cache-Control"] = "public, max-age=900"
-        resp.headers["ETag"] = etag
+        resp.set_etag(hashlib.sha1(feed_xml).hexdigest())
         return resp
 
     except FeedIndexBuildingError:
@@ -174,10 +180,6 @@ def public_feed() -> Response:
             mimetype="application/xml",
         )
 
-    etag = hashlib.sha1(feed_xml).hexdigest()
-    if request.headers.get("If-None-Match") == etag:
-        return Response(status=304)
-
     logger.info(
         "feed.generated",
         extra={"route": request.path, "filters": filters, "count": len(items)},
@@ -185,7 +187,7 @@ def public_feed() -> Response:
 
     resp = Response(feed_xml, mimetype=RSS_MIMETYPE)
     resp.headers["Cache-Control"] = "public, max-age=300"
-    resp.headers["ETag"] = etag
+    resp.set_etag(hashlib.sha1(feed_xml).hexdigest())
     return resp
 
 
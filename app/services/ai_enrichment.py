@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import heapq
 import os
 import re
 import textwrap
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from collections import Counter
 from typing import Optional
 
+import httpx
 import structlog
+from cachetools import LRUCache
 
 from app.services import items as items_service
+from app.utils import json_codec
 from app.utils.correlation import ensure_correlation_id
 
 logger = structlog.get_logger(__name__)
@@ -19,59 +24,128 @@ _MAX_CHARS = max(2000, int(os.getenv("AI_ENRICHMENT_MAX_CHARS", "12000")))
 _SUMMARY_WORD_LIMIT = max(50, int(os.getenv("SUMMARY_MAX_WORDS", "300")))
 _TAG_LIMIT = max(3, min(int(os.getenv("AUTO_TAG_LIMIT", "6")), 10))
 
-_executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
-
-_STOP_WORDS = {
-    "the",
-    "and",
-    "for",
-    "that",
-    "with",
-    "from",
-    "this",
-    "have",
-    "about",
-    "their",
-    "which",
-    "would",
-    "there",
-    "could",
-    "should",
-    "because",
-    "into",
-    "where",
-    "while",
-    "after",
-    "before",
-    "between",
-    "during",
-    "these",
-    "those",
-    "over",
-    "under",
-    "through",
-    "being",
-    "also",
-    "many",
-    "such",
-    "when",
-    "were",
-    "they",
-    "them",
-    "said",
-    "been",
-    "like",
-    "just",
-    "will",
-}
+_PROVIDER_TIMEOUT_SECONDS = float(os.getenv("AI_ENRICHMENT_TIMEOUT_SECONDS", "60"))
+
+_GEMINI_ENDPOINT = (
+    "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+)
+_OPENAI_ENDPOINT = "https://api.openai.com/v1/responses"
+
+# Enrichment runs on a single background event loop; provider calls are
+# network-bound, so one thread can keep many requests in flight while the
+# semaphore bounds how many items are enriched at once.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_semaphore = asyncio.Semaphore(_MAX_WORKERS)
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Item ids known to carry enrichment, so repeat scheduling skips the Firestore
+# lookup. Written from the enrichment loop and read from request threads.
+_enriched_items: LRUCache[str, bool] = LRUCache(maxsize=4096)
+_enriched_items_lock = threading.Lock()
+
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z\-]{2,}")
+
+_STOP_WORDS = frozenset(
+    {
+        "the",
+        "and",
+        "for",
+        "that",
+        "with",
+        "from",
+        "this",
+        "have",
+        "about",
+        "their",
+        "which",
+        "would",
+        "there",
+        "could",
+        "should",
+        "because",
+        "into",
+        "where",
+        "while",
+        "after",
+        "before",
+        "between",
+        "during",
+        "these",
+        "those",
+        "over",
+        "under",
+        "through",
+        "being",
+        "also",
+        "many",
+        "such",
+        "when",
+        "were",
+        "they",
+        "them",
+        "said",
+        "been",
+        "like",
+        "just",
+        "will",
+    }
+)
+
+
+# Only the article text varies per request, so the limits are baked in at import
+# and ``{text}`` is left as the sole placeholder for ``str.format``.
+_GEMINI_PROMPT_TEMPLATE = (
+    textwrap.dedent(
+        """
+        Summarise the following article in fewer than {word_limit} words
+        and extract up to {tag_limit} concise topical tags (each 1-3 words).
+
+        Return a JSON object with this schema:
+        {{{{
+          "summary": "string",
+          "tags": ["tag one", "tag two"]
+        }}}}
+
+        Article:
+        {text}
+        """
+    )
+    .strip()
+    .format(word_limit=_SUMMARY_WORD_LIMIT, tag_limit=_TAG_LIMIT, text="{text}")
+)
+_OPENAI_PROMPT_TEMPLATE = (
+    textwrap.dedent(
+        """
+        Summarise the following article in fewer than {word_limit} words
+        and extract up to {tag_limit} concise topical tags (each 1-3 words).
+        Respond using JSON with keys "summary" (string) and "tags" (array of strings).
+
+        Article:
+        {text}
+        """
+    )
+    .strip()
+    .format(word_limit=_SUMMARY_WORD_LIMIT, tag_limit=_TAG_LIMIT, text="{text}")
+)
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "false").lower() in {"true", "1", "yes"}
+
+
+# Feature flags are resolved once at import; deployments set them via env and
+# do not toggle them at runtime.
+_SUMMARY_ENABLED = _env_flag("ENABLE_SUMMARY")
+_AUTO_TAG_ENABLED = _env_flag("ENABLE_AUTO_TAGS")
 
 
 def _is_summary_enabled() -> bool:
-    return os.getenv("ENABLE_SUMMARY", "false").lower() in {"true", "1", "yes"}
+    return _SUMMARY_ENABLED
 
 
 def _is_auto_tag_enabled() -> bool:
-    return os.getenv("ENABLE_AUTO_TAGS", "false").lower() in {"true", "1", "yes"}
+    return _AUTO_TAG_ENABLED
 
 
 def maybe_schedule_enrichment(
@@ -86,17 +160,64 @@ def maybe_schedule_enrichment(
         return
 
     # Avoid rescheduling if the item already has enrichment.
+    if _is_known_enriched(item_id):
+        return
     existing_item = items_service.get_item(item_id)
     if existing_item and existing_item.summary_text and existing_item.auto_tags:
+        _remember_enriched(item_id)
         return
 
-    _executor.submit(_enrich_item, item_id, text, correlation_id)
+    _schedule(_enrich_item(item_id, text, correlation_id))
+
+
+def _is_known_enriched(item_id: str) -> bool:
+    with _enriched_items_lock:
+        return _enriched_items.get(item_id, False)
+
+
+def _remember_enriched(item_id: str) -> None:
+    with _enriched_items_lock:
+        _enriched_items[item_id] = True
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name="ai-enrichment-loop",
+                    daemon=True,
+                ).start()
+                _loop = loop
+    return _loop
+
+
+def _schedule(coro) -> None:
+    asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
 
+def _get_http_client() -> httpx.AsyncClient:
+    # Created lazily so the client binds to the enrichment loop.
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(timeout=_PROVIDER_TIMEOUT_SECONDS)
+    return _http_client
 
-def _enrich_item(item_id: str, text: str, correlation_id: Optional[str]) -> None:
+
+async def _enrich_item(item_id: str, text: str, correlation_id: Optional[str]) -> None:
+    async with _semaphore:
+        await _run_enrichment(item_id, text, correlation_id)
+
+
+async def _run_enrichment(
+    item_id: str, text: str, correlation_id: Optional[str]
+) -> None:
     ensure_correlation_id(correlation_id)
     try:
-        summary, tags = generate_enrichment(text)
+        summary, tags = await generate_enrichment(text)
     except Exception as exc:  # pragma: no cover - defensive guard
         # structlog uses the positional argument for the event name; keep ``event`` keyword-only.
         logger.error(
@@ -107,31 +228,45 @@ def _enrich_item(item_id: str, text: str, correlation_id: Optional[str]) -> None
         )
         return
 
+    # Summary and tags touch separate fields, so persist them concurrently.
+    # ``asyncio.to_thread`` copies the context, keeping the bound correlation id.
+    writes = []
     if summary and _is_summary_enabled():
-        try:
-            items_service.update_item_summary(item_id, summary)
-        except Exception as exc:  # pragma: no cover - defensive guard
-            # structlog uses the positional argument for the event name; keep ``event`` keyword-only.
-            logger.error(
-                event="ai_summary_persist_failed",
-                operation="ai.summary_persist_failed",
-                item_id=item_id,
-                error=str(exc),
+        writes.append(
+            (
+                asyncio.to_thread(items_service.update_item_summary, item_id, summary),
+                "ai_summary_persist_failed",
+                "ai.summary_persist_failed",
             )
+        )
     if tags and _is_auto_tag_enabled():
-        try:
-            items_service.update_item_auto_tags(item_id, tags)
-        except Exception as exc:  # pragma: no cover - defensive guard
+        writes.append(
+            (
+                asyncio.to_thread(items_service.update_item_auto_tags, item_id, tags),
+                "ai_auto_tags_persist_failed",
+                "ai.auto_tags_persist_failed",
+            )
+        )
+
+    results = await asyncio.gather(
+        *(write for write, _, _ in writes), return_exceptions=True
+    )
+    failed = False
+    for result, (_, event, operation) in zip(results, writes):
+        if isinstance(result, Exception):  # pragma: no cover - defensive guard
+            failed = True
             # structlog uses the positional argument for the event name; keep ``event`` keyword-only.
             logger.error(
-                event="ai_auto_tags_persist_failed",
-                operation="ai.auto_tags_persist_failed",
+                event=event,
+                operation=operation,
                 item_id=item_id,
-                error=str(exc),
+                error=str(result),
             )
+    if writes and not failed:
+        _remember_enriched(item_id)
 
 
-def generate_enrichment(text: str) -> tuple[Optional[str], list[str]]:
+async def generate_enrichment(text: str) -> tuple[Optional[str], list[str]]:
     """Generate summary and tags using the configured provider with heuristics fallback."""
     provider = (
         os.getenv("SUMMARY_PROVIDER") or os.getenv("AUTO_TAG_PROVIDER") or ""
@@ -139,11 +274,11 @@ def generate_enrichment(text: str) -> tuple[Optional[str], list[str]]:
     clipped = _clip_text(text)
 
     if provider == "gemini":
-        result = _query_gemini(clipped)
+        result = await _query_gemini(clipped)
         if result:
             return result
     elif provider == "openai":
-        result = _query_openai(clipped)
+        result = await _query_openai(clipped)
         if result:
             return result
 
@@ -159,7 +294,7 @@ def _clip_text(text: str) -> str:
     return stripped[:_MAX_CHARS]
 
 
-def _query_gemini(text: str) -> Optional[tuple[str, list[str]]]:
+async def _query_gemini(text: str) -> Optional[tuple[str, list[str]]]:
     api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GENERATIVEAI_API_KEY")
     if not api_key:
         # structlog uses the positional argument for the event name; keep ``event`` keyword-only.
@@ -170,43 +305,20 @@ def _query_gemini(text: str) -> Optional[tuple[str, list[str]]]:
             reason="missing_api_key",
         )
         return None
-    try:
-        import google.generativeai as genai  # type: ignore[import-untyped]
-    except ImportError:
-        # structlog uses the positional argument for the event name; keep ``event`` keyword-only.
-        logger.warning(
-            event="ai_provider_unavailable",
-            operation="ai.provider_unavailable",
-            provider="gemini",
-            reason="package_missing",
-        )
-        return None
 
     model_name = os.getenv("SUMMARY_MODEL", "gemini-1.5-flash")
-    prompt = textwrap.dedent(
-        f"""
-        Summarise the following article in fewer than {_SUMMARY_WORD_LIMIT} words
-        and extract up to {_TAG_LIMIT} concise topical tags (each 1-3 words).
-
-        Return a JSON object with this schema:
-        {{
-          "summary": "string",
-          "tags": ["tag one", "tag two"]
-        }}
-
-        Article:
-        {text}
-        """
-    ).strip()
+    prompt = _GEMINI_PROMPT_TEMPLATE.format(text=text)
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(model_name)
-        result = model.generate_content(
-            prompt,
-            generation_config={"response_mime_type": "application/json"},
+        response = await _get_http_client().post(
+            _GEMINI_ENDPOINT.format(model=model_name),
+            headers={"x-goog-api-key": api_key},
+            json={
+                "contents": [{"parts": [{"text": prompt}]}],
+                "generationConfig": {"responseMimeType": "application/json"},
+            },
         )
-        raw = getattr(result, "text", None) or getattr(result, "candidates", [])
-        payload = _parse_structured_response(raw)
+        response.raise_for_status()
+        payload = _parse_structured_response(_gemini_output_text(response.json()))
         if payload:
             return payload
     except Exception as exc:  # pragma: no cover - external dependency
@@ -220,45 +332,26 @@ def _query_gemini(text: str) -> Optional[tuple[str, list[str]]]:
     return None
 
 
-def _query_openai(text: str) -> Optional[tuple[str, list[str]]]:
+async def _query_openai(text: str) -> Optional[tuple[str, list[str]]]:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         return None
-    try:
-        from openai import OpenAI  # type: ignore[import-untyped]
-    except ImportError:
-        # structlog uses the positional argument for the event name; keep ``event`` keyword-only.
-        logger.warning(
-            event="ai_provider_unavailable",
-            operation="ai.provider_unavailable",
-            provider="openai",
-            reason="package_missing",
-        )
-        return None
 
     model = os.getenv("SUMMARY_MODEL", "gpt-4o-mini")
-    prompt = textwrap.dedent(
-        f"""
-        Summarise the following article in fewer than {_SUMMARY_WORD_LIMIT} words
-        and extract up to {_TAG_LIMIT} concise topical tags (each 1-3 words).
-        Respond using JSON with keys "summary" (string) and "tags" (array of strings).
-
-        Article:
-        {text}
-        """
-    ).strip()
+    prompt = _OPENAI_PROMPT_TEMPLATE.format(text=text)
     try:
-        client = OpenAI(api_key=api_key)
-        response = client.responses.create(
-            model=model,
-            input=prompt,
-            temperature=0.2,
-            response_format={"type": "json_object"},
+        response = await _get_http_client().post(
+            _OPENAI_ENDPOINT,
+            headers={"Authorization": f"Bearer {api_key}"},
+            json={
+                "model": model,
+                "input": prompt,
+                "temperature": 0.2,
+                "text": {"format": {"type": "json_object"}},
+            },
         )
-        raw = getattr(response, "output_text", None) or getattr(
-            response, "choices", None
-        )
-        payload = _parse_structured_response(raw)
+        response.raise_for_status()
+        payload = _parse_structured_response(_openai_output_text(response.json()))
         if payload:
             return payload
     except Exception as exc:  # pragma: no cover - external dependency
@@ -272,6 +365,23 @@ def _query_openai(text: str) -> Optional[tuple[str, list[str]]]:
     return None
 
 
+def _gemini_output_text(body: dict) -> Optional[str]:
+    for candidate in body.get("candidates") or []:
+        for part in (candidate.get("content") or {}).get("parts") or []:
+            text = part.get("text")
+            if text:
+                return text
+    return None
+
+
+def _openai_output_text(body: dict) -> Optional[str]:
+    for output in body.get("output") or []:
+        for content in output.get("content") or []:
+            if content.get("type") == "output_text" and content.get("text"):
+                return content["text"]
+    return None
+
+
 def _parse_structured_response(raw) -> Optional[tuple[str, list[str]]]:
     if raw is None:
         return None
@@ -284,9 +394,12 @@ def _parse_structured_response(raw) -> Optional[tuple[str, list[str]]]:
                 break
     if not isinstance(raw, str):
         return None
+    # Generation cut off mid-object leaves no closing brace; skip the doomed parse.
+    if not raw.rstrip().endswith("}"):
+        return None
     try:
-        payload = json.loads(raw)
-    except json.JSONDecodeError:
+        payload = json_codec.loads(raw)
+    except json_codec.JSONDecodeError:
         return None
 
     summary = payload.get("summary")
@@ -301,22 +414,18 @@ def _parse_structured_response(raw) -> Optional[tuple[str, list[str]]]:
 def _normalize_tags(tags) -> list[str]:
     if not isinstance(tags, list):
         return []
-    cleaned: list[str] = []
-    seen: set[str] = set()
+    # Keyed by lowercase tag; insertion order keeps the first spelling seen.
+    cleaned: dict[str, str] = {}
     for raw_tag in tags:
         if not isinstance(raw_tag, str):
             continue
         tag = raw_tag.strip()
         if not tag:
             continue
-        lowered = tag.lower()
-        if lowered in seen:
-            continue
-        cleaned.append(tag)
-        seen.add(lowered)
+        cleaned.setdefault(tag.lower(), tag)
         if len(cleaned) >= _TAG_LIMIT:
             break
-    return cleaned
+    return list(cleaned.values())
 
 
 def _truncate_words(text: str, limit: int) -> str:
@@ -334,23 +443,13 @@ def _fallback_summary(text: str) -> str:
 
 
 def _fallback_tags(text: str) -> list[str]:
-    words = re.findall(r"[A-Za-z][A-Za-z\\-]{2,}", text.lower())
-    frequency: dict[str, int] = {}
-    for word in words:
-        if word in _STOP_WORDS:
-            continue
-        frequency[word] = frequency.get(word, 0) + 1
-
-    if not frequency:
-        return []
-
-    sorted_words = sorted(
-        frequency.items(),
-        key=lambda item: (-item[1], item[0]),
+    # Count every token in C, then drop the handful of stop words present rather
+    # than testing each token against the stop list.
+    counter = Counter(_WORD_RE.findall(text.lower()))
+    for word in _STOP_WORDS.intersection(counter):
+        del counter[word]
+    # Break frequency ties alphabetically so tags stay stable across articles.
+    top = heapq.nsmallest(
+        _TAG_LIMIT, counter.items(), key=lambda item: (-item[1], item[0])
     )
-    tags: list[str] = []
-    for word, _ in sorted_words:
-        tags.append(word.title())
-        if len(tags) >= _TAG_LIMIT:
-            break
-    return tags
+    return [word.title() for word, _ in top]
@@ -1,14 +1,17 @@
 import asyncio
+import atexit
+import contextlib
 import hashlib
-import json
 import logging
 import os
+import threading
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 from typing import Callable, Optional
 
-from cachetools import TTLCache
+import structlog
 
 from app.services.firestore_helpers import normalise_timestamp
 from app.services.exceptions import (
@@ -17,9 +20,13 @@ from app.services.exceptions import (
     ParseError,
     TruncatedError,
 )
+from app.utils import json_codec
 from urllib.parse import quote
 
 logger = logging.getLogger(__name__)
+# Archive events carry their fields as structlog key/values so the configured
+# renderer emits them as indexable JSON keys rather than a pre-serialised string.
+_event_logger = structlog.get_logger(__name__)
 
 ArchiveFetcher = Callable[[str], dict]
 ExtractorFn = Callable[[str, str, Optional[str]], dict]
@@ -35,12 +42,14 @@ EVENT_ARCHIVE_FETCH = "archive_fetch"
 EVENT_ARCHIVE_PROCESS = "archive_process"
 EVENT_ARCHIVE_RECOVERED = "archive_recovered"
 EVENT_ARCHIVE_RECOVER_START = "archive_recover_start"
-EVENT_ARCHIVE_RECOVER_SKIP_TINY_DEADLINE = "archive_recover_skip_tiny_deadline"
 EVENT_ARCHIVE_RECOVER_TIMEOUT = "archive_recover_timeout"
 EVENT_ARCHIVE_RECOVER_FINISH = "archive_recover_finish"
 
 ARCHIVE_TODAY_BASE_URL = os.getenv("ARCHIVE_TODAY_BASE_URL", "https://archive.today")
 WAYBACK_API_URL = os.getenv("WAYBACK_API_URL", "https://archive.org/wayback/available")
+_ARCHIVE_TODAY_ROOT = ARCHIVE_TODAY_BASE_URL.rstrip("/") + "/latest/"
+_WAYBACK_ROOT = WAYBACK_API_URL.rstrip("/") + "?url="
+ARCHIVE_SERVICES = (SERVICE_ARCHIVE_TODAY, SERVICE_WAYBACK)
 ARCHIVE_TIMEOUT_SECONDS = float(os.getenv("ARCHIVE_TIMEOUT", "8"))
 ARCHIVE_CONCURRENCY = max(1, int(os.getenv("ARCHIVE_CONCURRENCY", "2")))
 ARCHIVE_FAILURE_TTL_SECONDS = int(
@@ -51,29 +60,70 @@ ARCHIVE_FAILURE_COLLECTION = os.getenv(
 )
 
 try:
-    from google.cloud import firestore  # type: ignore[attr-defined]
+    from app.services.firestore_client import get_client
 except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    firestore = None  # type: ignore[assignment]
+    get_client = None  # type: ignore[assignment]
 
-_db = None
-if firestore is not None:
-    try:
-        _db = firestore.Client(project=os.getenv("GOOGLE_CLOUD_PROJECT"))
-    except Exception as exc:  # pragma: no cover - Firestore optional
-        logger.debug("Firestore client unavailable for archive caching: %s", exc)
+# Reuse the shared client rather than opening another gRPC channel.
+_db = get_client() if get_client is not None else None
 
-_failure_cache = TTLCache(
-    maxsize=int(os.getenv("ARCHIVE_FAILURE_CACHE_SIZE", "256")),
-    ttl=ARCHIVE_FAILURE_TTL_SECONDS,
+ARCHIVE_FAILURE_CACHE_SIZE = max(
+    1, int(os.getenv("ARCHIVE_FAILURE_CACHE_SIZE", "1024"))
 )
-_semaphore = asyncio.Semaphore(ARCHIVE_CONCURRENCY)
-
 
-def _log_archive_event(payload: dict[str, object]) -> None:
-    try:
-        logger.info("%s", json.dumps(payload, separators=(",", ":")))
-    except TypeError:  # pragma: no cover - fallback if value not serialisable
-        logger.info("archive_event %s", payload)
+ARCHIVE_CLEAN_CACHE_SIZE = max(1, int(os.getenv("ARCHIVE_CLEAN_CACHE_SIZE", "1024")))
+ARCHIVE_CLEAN_TTL_SECONDS = float(os.getenv("ARCHIVE_CLEAN_TTL_SECONDS", "300"))
+
+# URL -> ``time.monotonic()`` expiry. Hits move an entry to the young end, so
+# insertion order is recency order and eviction drops the least recently used
+# URL first while each entry keeps its own TTL. ``_clean_cache`` remembers URLs that
+# Firestore recently reported as having no live failure. Both share one lock.
+_failure_cache: dict[str, float] = {}
+_clean_cache: dict[str, float] = {}
+_failure_cache_lock = threading.Lock()
+
+# URL -> recovery task running on the recovery loop. Concurrent requests for the
+# same URL await that task instead of spending another full archive round trip.
+_inflight_recoveries: dict[str, asyncio.Task] = {}
+
+# Failure doc writes are buffered and committed in batches by a single flusher
+# task on the recovery loop; 500 is Firestore's per-batch write limit. The queue
+# is not thread-safe: only touch it from coroutines running on ``_get_loop()``.
+# Anything still queued at interpreter exit is drained by an ``atexit`` hook.
+ARCHIVE_FAILURE_BATCH_SIZE = 500
+ARCHIVE_FAILURE_FLUSH_SECONDS = float(os.getenv("ARCHIVE_FAILURE_FLUSH_SECONDS", "0.5"))
+_failure_writes: asyncio.Queue = asyncio.Queue(maxsize=ARCHIVE_FAILURE_BATCH_SIZE * 4)
+_failure_flusher: Optional[asyncio.Task] = None
+_EXIT_FLUSH_TIMEOUT_SECONDS = 5.0
+
+# Sync callers share one background event loop, so loop-bound primitives such
+# as ``_admission`` keep working across calls and no loop is built per call.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name="archive-recovery-loop",
+                    daemon=True,
+                ).start()
+                _loop = loop
+    return _loop
+
+
+def _log_archive_event(event: str, **fields: object) -> None:
+    # structlog runs its processor chain before the stdlib level check, so skip
+    # it outright when INFO is filtered out.
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    # structlog uses the positional argument for the event name; keep ``event`` keyword-only.
+    _event_logger.info(event=event, **fields)
 
 
 class AsyncArchiveRateLimiter:
@@ -82,17 +132,58 @@ class AsyncArchiveRateLimiter:
     def __init__(self, interval: float) -> None:
         self._interval = interval
         self._last_seen: dict[str, float] = {}
-        self._lock = asyncio.Lock()
 
     async def wait(self, key: str) -> None:
-        async with self._lock:
-            now = time.monotonic()
-            last = self._last_seen.get(key)
-            if last is not None:
-                remaining = last + self._interval - now
-                if remaining > 0:
-                    await asyncio.sleep(remaining)
-            self._last_seen[key] = time.monotonic()
+        now = time.monotonic()
+        last = self._last_seen.get(key)
+        ready_at = now if last is None else max(now, last + self._interval)
+        # Reserve the slot before sleeping. Nothing awaits between the read and
+        # the write, so callers never queue behind a sleep for another key and
+        # no loop-bound lock is needed.
+        self._last_seen[key] = ready_at
+        if ready_at > now:
+            await asyncio.sleep(ready_at - now)
+
+
+class ArchiveAdmission:
+    """Async admission counter whose limit can be changed at runtime."""
+
+    def __init__(self, limit: int) -> None:
+        self._limit = max(1, limit)
+        self._active = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    async def set_limit(self, limit: int) -> None:
+        async with self._condition:
+            self._limit = max(1, limit)
+            self._condition.notify_all()
+
+    async def __aenter__(self) -> "ArchiveAdmission":
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self._limit)
+            self._active += 1
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        # Release the slot before awaiting so a cancelled exit cannot leak it.
+        self._active -= 1
+        await asyncio.shield(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._condition:
+            self._condition.notify()
+
+
+_admission = ArchiveAdmission(ARCHIVE_CONCURRENCY)
+
+
+def set_archive_concurrency(limit: int) -> None:
+    """Change how many archive fetches may run at once; callable from any thread."""
+    asyncio.run_coroutine_threadsafe(_admission.set_limit(limit), _get_loop()).result()
 
 
 ARCHIVE_REQUEST_INTERVAL_SECONDS = float(
@@ -107,109 +198,260 @@ class ArchiveAttempt:
     fetch_url: str
 
 
+@lru_cache(maxsize=4096)
+def _quoted_url(url: str) -> str:
+    return quote(url, safe="")
+
+
+@lru_cache(maxsize=4096)
 def _cache_key(url: str) -> str:
     return hashlib.sha1(url.encode("utf-8")).hexdigest()
 
 
-def _should_skip_archive(url: str) -> bool:
-    """Returns True if this URL recently failed archive recovery."""
-    if url in _failure_cache:
+def _cache_contains(cache: dict[str, float], url: str) -> bool:
+    now = time.monotonic()
+    with _failure_cache_lock:
+        expires = cache.get(url)
+        if expires is None:
+            return False
+        del cache[url]
+        if expires > now:
+            cache[url] = expires
+            return True
+        return False
+
+
+def _cache_put(cache: dict[str, float], url: str, ttl: float, maxsize: int) -> None:
+    expires = time.monotonic() + ttl
+    with _failure_cache_lock:
+        # Re-insert so a refreshed entry moves to the young end.
+        cache.pop(url, None)
+        cache[url] = expires
+        while len(cache) > maxsize:
+            del cache[next(iter(cache))]
+
+
+def _failure_cached(url: str) -> bool:
+    return _cache_contains(_failure_cache, url)
+
+
+def _cache_failure(url: str) -> None:
+    with _failure_cache_lock:
+        _clean_cache.pop(url, None)
+    _cache_put(
+        _failure_cache, url, ARCHIVE_FAILURE_TTL_SECONDS, ARCHIVE_FAILURE_CACHE_SIZE
+    )
+
+
+def _cache_clean(url: str) -> None:
+    _cache_put(_clean_cache, url, ARCHIVE_CLEAN_TTL_SECONDS, ARCHIVE_CLEAN_CACHE_SIZE)
+
+
+def _skip_from_local_cache(url: str) -> bool:
+    if _failure_cached(url):
         _log_archive_event(
-            {
-                "event": EVENT_ARCHIVE_SKIP,
-                "url": url,
-                "reason": "local_cache",
-            }
+            EVENT_ARCHIVE_SKIP,
+            url=url,
+            reason="local_cache",
         )
         return True
+    return False
 
+
+def _failure_doc_ref(url: str):
+    # Callers check ``_db`` first; this narrows the Optional for type checkers.
     if _db is None:
-        return False
+        raise RuntimeError("Firestore client is not available for archive caching")
+    return _db.collection(ARCHIVE_FAILURE_COLLECTION).document(_cache_key(url))
 
-    doc_id = _cache_key(url)
-    doc_ref = _db.collection(ARCHIVE_FAILURE_COLLECTION).document(doc_id)
-    try:
-        snapshot = doc_ref.get()
-    except Exception as exc:  # pragma: no cover - requires Firestore
-        logger.debug("Firestore archive cache lookup failed for %s: %s", url, exc)
-        return False
 
+def _apply_failure_snapshot(url: str, snapshot) -> Optional[bool]:
+    """Update ``_failure_cache`` from a Firestore snapshot.
+
+    Returns the skip decision, or ``None`` when the stored failure has expired
+    and the document should be purged.
+    """
     if not snapshot.exists:
+        _cache_clean(url)
         return False
 
     payload = snapshot.to_dict() or {}
     expires_at = normalise_timestamp(payload.get("expiresAt"))
     if not expires_at:
+        _cache_clean(url)
         return False
 
     now = datetime.now(timezone.utc)
-    if expires_at > now:
-        already_cached = url in _failure_cache
-        _failure_cache[url] = expires_at
-        if already_cached:
-            _log_archive_event(
-                {
-                    "event": EVENT_ARCHIVE_SKIP,
-                    "url": url,
-                    "reason": "failure_cache",
-                }
-            )
-            return True
-        # Seeded from Firestore but allow this attempt to revalidate.
+    if expires_at <= now:
+        _cache_clean(url)
+        return None
+
+    already_cached = _failure_cached(url)
+    _cache_failure(url)
+    if already_cached:
         _log_archive_event(
-            {
-                "event": EVENT_ARCHIVE_CACHE_SEEDED,
-                "url": url,
-                "reason": "firestore_cache",
-            }
+            EVENT_ARCHIVE_SKIP,
+            url=url,
+            reason="failure_cache",
         )
-        return False
+        return True
+    # Seeded from Firestore but allow this attempt to revalidate.
+    _log_archive_event(
+        EVENT_ARCHIVE_CACHE_SEEDED,
+        url=url,
+        reason="firestore_cache",
+    )
+    return False
+
 
+def _purge_failure_doc(doc_ref, url: str) -> None:
     try:
         doc_ref.delete()
     except Exception as exc:  # pragma: no cover - requires Firestore
         logger.debug("Failed to purge expired archive cache doc for %s: %s", url, exc)
-    return False
+
+
+async def _should_skip_archive_async(url: str) -> bool:
+    """Returns True if this URL recently failed archive recovery.
+
+    Only the Firestore ``get``/``delete`` calls run in a worker thread;
+    ``_failure_cache`` is read and updated on the event loop.
+    """
+    if _skip_from_local_cache(url):
+        return True
+
+    if _db is None or _cache_contains(_clean_cache, url):
+        return False
+
+    doc_ref = _failure_doc_ref(url)
+    try:
+        snapshot = await asyncio.to_thread(doc_ref.get)
+    except Exception as exc:  # pragma: no cover - requires Firestore
+        logger.debug("Firestore archive cache lookup failed for %s: %s", url, exc)
+        return False
+
+    decision = _apply_failure_snapshot(url, snapshot)
+    if decision is None:
+        await asyncio.to_thread(_purge_failure_doc, doc_ref, url)
+        return False
+    return decision
 
 
 def _record_failure(url: str, reason: str) -> None:
     _log_archive_event(
-        {
-            "event": EVENT_ARCHIVE_FAILURE,
-            "url": url,
-            "reason": reason,
-        }
+        EVENT_ARCHIVE_FAILURE,
+        url=url,
+        reason=reason,
     )
-    _failure_cache[url] = datetime.now(timezone.utc)
+    _cache_failure(url)
     if _db is None:
         return
-    doc_id = _cache_key(url)
-    doc_ref = _db.collection(ARCHIVE_FAILURE_COLLECTION).document(doc_id)
-    expires_at = datetime.now(timezone.utc) + timedelta(
-        seconds=ARCHIVE_FAILURE_TTL_SECONDS
-    )
+    now = datetime.now(timezone.utc)
     payload = {
         "url": url,
         "reason": reason,
-        "updatedAt": datetime.now(timezone.utc),
-        "expiresAt": expires_at,
+        "updatedAt": now,
+        "expiresAt": now + timedelta(seconds=ARCHIVE_FAILURE_TTL_SECONDS),
     }
-    try:
-        doc_ref.set(payload, merge=True)
-    except Exception as exc:  # pragma: no cover - requires Firestore
-        logger.debug("Failed to cache archive failure for %s: %s", url, exc)
+    _queue_failure_write(url, payload)
 
 
 def _clear_failure(url: str) -> None:
-    _failure_cache.pop(url, None)
+    with _failure_cache_lock:
+        _failure_cache.pop(url, None)
     if _db is None:
         return
-    doc_id = _cache_key(url)
-    doc_ref = _db.collection(ARCHIVE_FAILURE_COLLECTION).document(doc_id)
+    _queue_failure_write(url, None)
+
+
+def _queue_failure_write(url: str, payload: Optional[dict]) -> None:
+    """Queue a failure doc upsert (or delete when ``payload`` is None).
+
+    Must run on the recovery loop. Sets and deletes share one queue so a clear
+    can never be overtaken by an older failure write for the same URL.
+    """
+    global _failure_flusher
     try:
-        doc_ref.delete()
+        _failure_writes.put_nowait((url, payload))
+    except asyncio.QueueFull:
+        logger.debug("Archive failure write queue full; dropping update for %s", url)
+        return
+    if _failure_flusher is None or _failure_flusher.done():
+        _failure_flusher = asyncio.get_running_loop().create_task(
+            _flush_failure_writes()
+        )
+
+
+async def _flush_failure_writes() -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        entries = [await _failure_writes.get()]
+        deadline = loop.time() + ARCHIVE_FAILURE_FLUSH_SECONDS
+        try:
+            while len(entries) < ARCHIVE_FAILURE_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entries.append(
+                        await asyncio.wait_for(_failure_writes.get(), remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Cancelled by the exit drain while collecting: commit what is held
+            # inline, since worker threads are no longer accepted at shutdown.
+            _commit_failure_writes(entries)
+            raise
+        await asyncio.to_thread(_commit_failure_writes, entries)
+
+
+async def _drain_failure_writes() -> None:
+    """Stop the flusher and commit every queued write on the recovery loop."""
+    flusher = _failure_flusher
+    if flusher is not None and not flusher.done():
+        flusher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await flusher
+    entries: list[tuple[str, Optional[dict]]] = []
+    while not _failure_writes.empty():
+        entries.append(_failure_writes.get_nowait())
+    for start in range(0, len(entries), ARCHIVE_FAILURE_BATCH_SIZE):
+        _commit_failure_writes(entries[start : start + ARCHIVE_FAILURE_BATCH_SIZE])
+
+
+def _flush_failure_writes_at_exit() -> None:
+    # The recovery loop runs on a daemon thread, so queued writes would be
+    # dropped silently when the process exits (e.g. a Cloud Run scale-down).
+    loop = _loop
+    if loop is None or _db is None or not loop.is_running():
+        return
+    future = asyncio.run_coroutine_threadsafe(_drain_failure_writes(), loop)
+    try:
+        future.result(timeout=_EXIT_FLUSH_TIMEOUT_SECONDS)
+    except Exception as exc:  # pragma: no cover - best effort at shutdown
+        logger.warning("Failed to flush archive failure writes at exit: %s", exc)
+
+
+atexit.register(_flush_failure_writes_at_exit)
+
+
+def _commit_failure_writes(entries: list[tuple[str, Optional[dict]]]) -> None:
+    if _db is None:
+        return
+    batch = _db.batch()
+    for url, payload in entries:
+        doc_ref = _failure_doc_ref(url)
+        if payload is None:
+            batch.delete(doc_ref)
+        else:
+            batch.set(doc_ref, payload, merge=True)
+    try:
+        batch.commit()
     except Exception as exc:  # pragma: no cover - requires Firestore
-        logger.debug("Failed to clear archive failure cache for %s: %s", url, exc)
+        logger.debug(
+            "Failed to commit %s archive failure cache writes: %s", len(entries), exc
+        )
 
 
 def _enqueue_archive_snapshot(url: str, service: str) -> None:
@@ -217,76 +459,64 @@ def _enqueue_archive_snapshot(url: str, service: str) -> None:
 
 
 async def _fetch_archive_today(url: str, fetcher: ArchiveFetcher) -> Optional[dict]:
-    snapshot_url = f"{ARCHIVE_TODAY_BASE_URL.rstrip('/')}/latest/{url}"
+    snapshot_url = _ARCHIVE_TODAY_ROOT + url
     await _rate_limiter.wait(SERVICE_ARCHIVE_TODAY)
     _log_archive_event(
-        {
-            "event": EVENT_ARCHIVE_FETCH,
-            "service": SERVICE_ARCHIVE_TODAY,
-            "url": url,
-            "stage": "request",
-        }
+        EVENT_ARCHIVE_FETCH,
+        service=SERVICE_ARCHIVE_TODAY,
+        url=url,
+        stage="request",
     )
-    async with _semaphore:
+    async with _admission:
         result = await asyncio.to_thread(fetcher, snapshot_url)
     if result.get("error"):
         _enqueue_archive_snapshot(url, SERVICE_ARCHIVE_TODAY)
         _log_archive_event(
-            {
-                "event": EVENT_ARCHIVE_FETCH,
-                "service": SERVICE_ARCHIVE_TODAY,
-                "url": url,
-                "status": "error",
-                "error_type": NetworkError.__name__,
-            }
+            EVENT_ARCHIVE_FETCH,
+            service=SERVICE_ARCHIVE_TODAY,
+            url=url,
+            status="error",
+            error_type=NetworkError.__name__,
         )
         return None
     _log_archive_event(
-        {
-            "event": EVENT_ARCHIVE_FETCH,
-            "service": SERVICE_ARCHIVE_TODAY,
-            "url": url,
-            "status": "retrieved",
-        }
+        EVENT_ARCHIVE_FETCH,
+        service=SERVICE_ARCHIVE_TODAY,
+        url=url,
+        status="retrieved",
     )
     return result
 
 
 async def _fetch_wayback(url: str, fetcher: ArchiveFetcher) -> Optional[dict]:
-    api_url = f"{WAYBACK_API_URL.rstrip('/')}?url={quote(url, safe='')}"
+    api_url = _WAYBACK_ROOT + _quoted_url(url)
     await _rate_limiter.wait("wayback_api")
     _log_archive_event(
-        {
-            "event": EVENT_ARCHIVE_FETCH,
-            "service": SERVICE_WAYBACK,
-            "url": url,
-            "stage": "api",
-        }
+        EVENT_ARCHIVE_FETCH,
+        service=SERVICE_WAYBACK,
+        url=url,
+        stage="api",
     )
-    async with _semaphore:
+    async with _admission:
         response = await asyncio.to_thread(fetcher, api_url)
     if response.get("error"):
         _log_archive_event(
-            {
-                "event": EVENT_ARCHIVE_FETCH,
-                "service": SERVICE_WAYBACK,
-                "url": url,
-                "status": "error",
-                "error_type": NetworkError.__name__,
-            }
+            EVENT_ARCHIVE_FETCH,
+            service=SERVICE_WAYBACK,
+            url=url,
+            status="error",
+            error_type=NetworkError.__name__,
         )
         return None
     try:
-        payload = json.loads(response.get("html", ""))
-    except json.JSONDecodeError:
+        payload = json_codec.loads(response.get("body") or response.get("html", ""))
+    except json_codec.JSONDecodeError:
         _log_archive_event(
-            {
-                "event": EVENT_ARCHIVE_FETCH,
-                "service": SERVICE_WAYBACK,
-                "url": url,
-                "status": "error",
-                "error_type": ParseError.__name__,
-            }
+            EVENT_ARCHIVE_FETCH,
+            service=SERVICE_WAYBACK,
+            url=url,
+            status="error",
+            error_type=ParseError.__name__,
         )
         return None
 
@@ -296,44 +526,36 @@ async def _fetch_wayback(url: str, fetcher: ArchiveFetcher) -> Optional[dict]:
     if not snapshot_url:
         _enqueue_archive_snapshot(url, SERVICE_WAYBACK)
         _log_archive_event(
-            {
-                "event": EVENT_ARCHIVE_FETCH,
-                "service": SERVICE_WAYBACK,
-                "url": url,
-                "status": "miss",
-            }
+            EVENT_ARCHIVE_FETCH,
+            service=SERVICE_WAYBACK,
+            url=url,
+            status="miss",
         )
         return None
 
     await _rate_limiter.wait("wayback_snapshot")
     _log_archive_event(
-        {
-            "event": EVENT_ARCHIVE_FETCH,
-            "service": SERVICE_WAYBACK,
-            "url": url,
-            "stage": "snapshot",
-        }
+        EVENT_ARCHIVE_FETCH,
+        service=SERVICE_WAYBACK,
+        url=url,
+        stage="snapshot",
     )
-    async with _semaphore:
+    async with _admission:
         snapshot = await asyncio.to_thread(fetcher, snapshot_url)
     if snapshot.get("error"):
         _log_archive_event(
-            {
-                "event": EVENT_ARCHIVE_FETCH,
-                "service": SERVICE_WAYBACK,
-                "url": url,
-                "status": "error",
-                "error_type": NetworkError.__name__,
-            }
+            EVENT_ARCHIVE_FETCH,
+            service=SERVICE_WAYBACK,
+            url=url,
+            status="error",
+            error_type=NetworkError.__name__,
         )
         return None
     _log_archive_event(
-        {
-            "event": EVENT_ARCHIVE_FETCH,
-            "service": SERVICE_WAYBACK,
-            "url": url,
-            "status": "retrieved",
-        }
+        EVENT_ARCHIVE_FETCH,
+        service=SERVICE_WAYBACK,
+        url=url,
+        status="retrieved",
     )
     return snapshot
 
@@ -364,24 +586,20 @@ async def _attempt_archive(
     )
     if processed.get("error"):
         _log_archive_event(
-            {
-                "event": EVENT_ARCHIVE_PROCESS,
-                "service": label,
-                "url": url,
-                "status": "error",
-                "error_type": ParseError.__name__,
-            }
+            EVENT_ARCHIVE_PROCESS,
+            service=label,
+            url=url,
+            status="error",
+            error_type=ParseError.__name__,
         )
         return None
     if is_truncated(processed.get("text")):
         _log_archive_event(
-            {
-                "event": EVENT_ARCHIVE_PROCESS,
-                "service": label,
-                "url": url,
-                "status": "truncated",
-                "error_type": TruncatedError.__name__,
-            }
+            EVENT_ARCHIVE_PROCESS,
+            service=label,
+            url=url,
+            status="truncated",
+            error_type=TruncatedError.__name__,
         )
         return None
 
@@ -389,96 +607,107 @@ async def _attempt_archive(
     processed["archive_snapshot_url"] = snapshot.get("final_url")
     recovered_length = len((processed.get("text") or "").strip())
     _log_archive_event(
-        {
-            "event": EVENT_ARCHIVE_RECOVERED,
-            "service": label,
-            "url": url,
-            "chars": recovered_length,
-        }
+        EVENT_ARCHIVE_RECOVERED,
+        service=label,
+        url=url,
+        chars=recovered_length,
     )
     return processed
 
 
-async def recover_truncated_content_async(
+async def _attempt_archive_safely(
+    label: str,
     url: str,
-    extracted_text: Optional[str],
-    *,
-    extractor: ExtractorFn,
     fetcher: ArchiveFetcher,
+    extractor: ExtractorFn,
     is_truncated: IsTruncatedFn,
 ) -> Optional[dict]:
-    if not is_truncated(extracted_text):
+    try:
+        return await _attempt_archive(label, url, fetcher, extractor, is_truncated)
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.warning("Archive lookup via %s failed for %s: %s", label, url, exc)
         return None
 
-    if _should_skip_archive(url):
+
+async def _recover_archived_content(
+    url: str,
+    *,
+    extractor: ExtractorFn,
+    fetcher: ArchiveFetcher,
+    is_truncated: IsTruncatedFn,
+) -> Optional[dict]:
+    if _skip_from_local_cache(url):
         return None
 
-    services = (SERVICE_ARCHIVE_TODAY, SERVICE_WAYBACK)
-    deadline = time.perf_counter() + ARCHIVE_TIMEOUT_SECONDS
     _log_archive_event(
-        {
-            "event": EVENT_ARCHIVE_RECOVER_START,
-            "url": url,
-            "services": list(services),
-        }
+        EVENT_ARCHIVE_RECOVER_START,
+        url=url,
+        services=ARCHIVE_SERVICES,
     )
 
-    for service in services:
-        MIN_ATTEMPT_SECONDS = 0.25  # Based on observed overhead
-        remaining = deadline - time.perf_counter()
-        if remaining <= MIN_ATTEMPT_SECONDS:
-            _log_archive_event(
-                {
-                    "event": EVENT_ARCHIVE_RECOVER_SKIP_TINY_DEADLINE,
-                    "url": url,
-                    "service": service,
-                    "remaining_seconds": remaining,
-                }
-            )
-            break
-        try:
-            result = await asyncio.wait_for(
-                _attempt_archive(service, url, fetcher, extractor, is_truncated),
-                timeout=remaining,
-            )
-        except asyncio.TimeoutError:
-            _record_failure(url, "timeout")
-            _log_archive_event(
-                {
-                    "event": EVENT_ARCHIVE_RECOVER_TIMEOUT,
-                    "url": url,
-                    "error_type": ArchiveTimeout.__name__,
-                    "service": service,
-                }
-            )
-            return None
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.warning("Archive lookup via %s failed for %s: %s", service, url, exc)
-            continue
-        if result:
-            _clear_failure(url)
-            _log_archive_event(
-                {
-                    "event": EVENT_ARCHIVE_RECOVER_FINISH,
-                    "url": url,
-                    "status": "success",
-                    "service": service,
-                }
-            )
-            return result
+    # Query every provider at once and keep the first usable snapshot, so a slow
+    # or missing archive.today copy no longer delays the Wayback lookup.
+    attempts = [
+        asyncio.create_task(
+            _attempt_archive_safely(service, url, fetcher, extractor, is_truncated)
+        )
+        for service in ARCHIVE_SERVICES
+    ]
+    # The Firestore failure lookup overlaps the provider requests instead of
+    # adding a round trip in front of them; it only aborts recovery if it
+    # reports a skip before a provider succeeds.
+    skip_task = (
+        asyncio.create_task(_should_skip_archive_async(url))
+        if _db is not None and not _cache_contains(_clean_cache, url)
+        else None
+    )
+    waiting = attempts + [skip_task] if skip_task is not None else attempts
+    try:
+        for next_done in asyncio.as_completed(waiting, timeout=ARCHIVE_TIMEOUT_SECONDS):
+            outcome = await next_done
+            # Provider attempts yield a dict or None; the skip lookup yields a bool.
+            if outcome is True:
+                return None
+            if outcome:
+                _clear_failure(url)
+                _log_archive_event(
+                    EVENT_ARCHIVE_RECOVER_FINISH,
+                    url=url,
+                    status="success",
+                    service=outcome["fetched_via"],
+                )
+                return outcome
+    except asyncio.TimeoutError:
+        _record_failure(url, "timeout")
+        _log_archive_event(
+            EVENT_ARCHIVE_RECOVER_TIMEOUT,
+            url=url,
+            error_type=ArchiveTimeout.__name__,
+            services=[
+                service
+                for service, task in zip(ARCHIVE_SERVICES, attempts)
+                if not task.done()
+            ],
+        )
+        return None
+    finally:
+        # Cancelling a pending lookup also stops it seeding the cache after a
+        # success has already cleared the failure. Waiting for the cancellations
+        # to land keeps losers from outliving the recovery as orphaned tasks.
+        for task in waiting:
+            task.cancel()
+        await asyncio.gather(*waiting, return_exceptions=True)
 
     _record_failure(url, "no_snapshot")
     _log_archive_event(
-        {
-            "event": EVENT_ARCHIVE_RECOVER_FINISH,
-            "url": url,
-            "status": "failure",
-        }
+        EVENT_ARCHIVE_RECOVER_FINISH,
+        url=url,
+        status="failure",
     )
     return None
 
 
-def recover_truncated_content(
+async def recover_truncated_content_async(
     url: str,
     extracted_text: Optional[str],
     *,
@@ -486,31 +715,41 @@ def recover_truncated_content(
     fetcher: ArchiveFetcher,
     is_truncated: IsTruncatedFn,
 ) -> Optional[dict]:
-    try:
-        return asyncio.run(
-            recover_truncated_content_async(
-                url,
-                extracted_text,
-                extractor=extractor,
-                fetcher=fetcher,
-                is_truncated=is_truncated,
+    if not is_truncated(extracted_text):
+        return None
+
+    task = _inflight_recoveries.get(url)
+    if task is None:
+        task = asyncio.create_task(
+            _recover_archived_content(
+                url, extractor=extractor, fetcher=fetcher, is_truncated=is_truncated
             )
         )
-    except RuntimeError as exc:
-        if "asyncio.run()" not in str(exc):
-            raise
-        loop = asyncio.new_event_loop()
-        try:
-            asyncio.set_event_loop(loop)
-            return loop.run_until_complete(
-                recover_truncated_content_async(
-                    url,
-                    extracted_text,
-                    extractor=extractor,
-                    fetcher=fetcher,
-                    is_truncated=is_truncated,
-                )
-            )
-        finally:
-            asyncio.set_event_loop(None)
-            loop.close()
+        _inflight_recoveries[url] = task
+        task.add_done_callback(lambda _task: _inflight_recoveries.pop(url, None))
+    # Shield the shared task so one caller giving up does not cancel the
+    # recovery other callers are waiting on, and hand each caller its own copy
+    # because callers annotate the result.
+    recovered = await asyncio.shield(task)
+    return dict(recovered) if recovered else recovered
+
+
+def recover_truncated_content(
+    url: str,
+    extracted_text: Optional[str],
+    *,
+    extractor: ExtractorFn,
+    fetcher: ArchiveFetcher,
+    is_truncated: IsTruncatedFn,
+) -> Optional[dict]:
+    future = asyncio.run_coroutine_threadsafe(
+        recover_truncated_content_async(
+            url,
+            extracted_text,
+            extractor=extractor,
+            fetcher=fetcher,
+            is_truncated=is_truncated,
+        ),
+        _get_loop(),
+    )
+    return future.result()
@@ -1,22 +1,21 @@
 import os
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import cast
 from flask import g
 
 from google.cloud import firestore
 from google.cloud.exceptions import GoogleCloudError
 
+from app.services import firestore_client
 from app.services.firestore_helpers import ensure_db_client
 
 logger = logging.getLogger(__name__)
 
-AUDIT_COLLECTION = os.getenv("FIRESTORE_COLLECTION_AUDIT", "audit")
+# ``_require_db()`` reports a missing client, so type it as present here.
+db = cast(firestore.Client, firestore_client.db)
 
-try:
-    db = firestore.Client(project=os.getenv("GOOGLE_CLOUD_PROJECT"))
-except Exception as exc:  # pragma: no cover - defensive logging
-    logger.critical("Failed to initialize Firestore client for audit service: %s", exc)
-    db = None
+AUDIT_COLLECTION = os.getenv("FIRESTORE_COLLECTION_AUDIT", "audit")
 
 
 class FirestoreError(Exception):
@@ -68,7 +67,7 @@ def log_admin_action(
             "admin_email": user.get("email"),
             "action": action,
             "target_id": target_id,
-            "timestamp": datetime.utcnow(),
+            "timestamp": datetime.now(timezone.utc),
             "details": details or {},
         }
         audit_ref.set(log_entry)
@@ -1,8 +1,8 @@
+import heapq
 import logging
 import os
 from datetime import datetime, timezone
 
-from cachetools import cached, TTLCache
 from google.cloud import firestore
 from google.cloud.exceptions import GoogleCloudError
 
@@ -12,6 +12,7 @@ from app.services.firestore_helpers import (
     clear_cached_functions,
     ensure_db_client,
 )
+from app.utils.ttl_cache import ttl_cache
 
 from typing import Optional
 
@@ -19,14 +20,20 @@ logger = logging.getLogger(__name__)
 
 BUCKETS_COLLECTION = os.getenv("FIRESTORE_COLLECTION_BUCKETS", "buckets")
 _BUCKET_FIELDS = set(Bucket.__dataclass_fields__)
+# Stored fields the Bucket model reads; reads project onto these so unrelated
+# document data never crosses the wire. ``id`` comes from the doc reference.
+_BUCKET_PROJECTION = sorted(_BUCKET_FIELDS - {"id"})
+# ``db`` is bound once at import, so its availability never changes afterwards.
+_db_ready = db is not None
 
 
 def _require_db() -> None:
-    ensure_db_client(
-        db,
-        FirestoreError,
-        "Firestore client is not initialized. Check application startup logs.",
-    )
+    if not _db_ready:
+        ensure_db_client(
+            db,
+            FirestoreError,
+            "Firestore client is not initialized. Check application startup logs.",
+        )
 
 
 def _timestamp_to_sortable(value: datetime | None) -> float:
@@ -64,16 +71,18 @@ def _invalidate_feed_cache(bucket_slug: str) -> None:
     _invalidate(bucket_slug)
 
 
-@cached(cache=TTLCache(maxsize=32, ttl=600))
+@ttl_cache(maxsize=32, ttl=600)
 def get_bucket_by_slug(slug: str) -> Bucket | None:
     """Retrieves a single bucket by its slug."""
     _require_db()
     try:
         normalised = (slug or "").strip().lower()
         buckets_ref = db.collection(BUCKETS_COLLECTION)
-        query = buckets_ref.where(
-            filter=firestore.FieldFilter("slug", "==", normalised)
-        ).limit(1)
+        query = (
+            buckets_ref.where(filter=firestore.FieldFilter("slug", "==", normalised))
+            .select(_BUCKET_PROJECTION)
+            .limit(1)
+        )
         docs = list(query.stream())
         if not docs:
             return None
@@ -87,7 +96,7 @@ def get_bucket_by_slug(slug: str) -> Bucket | None:
         ) from e
 
 
-@cached(cache=TTLCache(maxsize=128, ttl=600))
+@ttl_cache(maxsize=128, ttl=600)
 def get_bucket(bucket_id: str) -> Bucket | None:
     """Retrieves a single bucket by its ID."""
     _require_db()
@@ -106,27 +115,25 @@ def get_bucket(bucket_id: str) -> Bucket | None:
         ) from e
 
 
-@cached(cache=TTLCache(maxsize=1, ttl=600))
+@ttl_cache(maxsize=1, ttl=600)
 def list_buckets() -> list[Bucket]:
     """Lists all buckets."""
     _require_db()
     try:
         buckets_ref = db.collection(BUCKETS_COLLECTION)
-        docs = buckets_ref.stream()
+        docs = buckets_ref.select(_BUCKET_PROJECTION).stream()
         return [_doc_to_bucket(doc) for doc in docs]
     except GoogleCloudError as e:
         logger.error(f"Firestore error listing buckets: {e}", exc_info=True)
         raise FirestoreError("Failed to list buckets from Firestore.") from e
 
 
-@cached(cache=TTLCache(maxsize=8, ttl=300))
+@ttl_cache(maxsize=8, ttl=300)
 def list_recent_buckets(limit: int = 4) -> list[Bucket]:
     """Returns the most recently created or updated buckets."""
-    buckets = list(list_buckets())
     if limit <= 0:
         return []
-    buckets.sort(key=_bucket_recency_key)
-    return buckets[:limit]
+    return heapq.nsmallest(limit, list_buckets(), key=_bucket_recency_key)
 
 
 def create_bucket(
@@ -143,7 +150,7 @@ def create_bucket(
     try:
         slug = (slug or "").strip().lower()
         bucket_ref = db.collection(BUCKETS_COLLECTION).document()
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         new_bucket = Bucket(
             name=name,
             slug=slug,
@@ -162,7 +169,7 @@ def create_bucket(
         }
         bucket_ref.set(payload)
         clear_cached_functions(
-            (list_buckets, list_recent_buckets, get_bucket, get_bucket_by_slug)
+            list_buckets, list_recent_buckets, get_bucket, get_bucket_by_slug
         )
         _invalidate_feed_cache(new_bucket.slug)
         return bucket_ref.id
@@ -1,22 +1,22 @@
 import hashlib
 import html
-import json
 import logging
 import os
-import re
 import time
 from datetime import datetime, timezone, timedelta
-from typing import Callable, Optional, Any, Iterable
+from functools import lru_cache
+from typing import Optional, Any, Iterable
 from urllib.parse import urlparse
+from xml.sax.saxutils import escape as xml_escape
 
 from feedgen.feed import FeedGenerator  # type: ignore[import-untyped]
-from lxml import etree
 from flask import request
 from google.api_core.exceptions import FailedPrecondition
 
 from app.extensions import cache
 from app.services.firestore_helpers import extract_index_url
 from app.signals import item_updated
+from app.utils import json_codec
 
 from .buckets import get_bucket, get_bucket_by_slug, list_buckets
 from .items import list_items
@@ -30,9 +30,13 @@ DEFAULT_FEED_IMAGE = os.getenv("DEFAULT_FEED_IMAGE")
 DEFAULT_EPISODE_IMAGE = os.getenv("DEFAULT_EPISODE_IMAGE")
 FEED_ITEMS_PER_PAGE = max(1, int(os.getenv("FEED_ITEMS_PER_PAGE", "50")))
 FEED_CACHE_MAX_PAGES = max(10, int(os.getenv("FEED_CACHE_MAX_PAGES", "200")))
-FEED_CACHE_MAX_CONSECUTIVE_MISSES = max(
-    1, int(os.getenv("FEED_CACHE_MAX_CONSECUTIVE_MISSES", "5"))
-)
+FEED_CURSOR_CACHE_SECONDS = int(os.getenv("FEED_CURSOR_CACHE_SECONDS", "600"))
+# Podcast clients ignore indentation, so feeds are compact unless debugging.
+FEED_PRETTY_PRINT = os.getenv("FEED_PRETTY_PRINT", "false").lower() in {
+    "true",
+    "1",
+    "yes",
+}
 PUBLIC_FEED_TITLE = os.getenv("PUBLIC_FEED_TITLE", "Zissou Public Podcast")
 PUBLIC_FEED_DESCRIPTION = os.getenv(
     "PUBLIC_FEED_DESCRIPTION",
@@ -57,48 +61,63 @@ SUBSCRIPTION_LINKS = {
 }
 
 
-def _delete_cache_key(delete_fn: Callable[[str], bool | None], key: str) -> bool:
-    """Delete a cache key and return True when a value is actually removed."""
-    try:
-        removed = delete_fn(key)
-    except TypeError:
-        # Some backends raise when the key does not exist.
-        return False
-    return bool(removed)
-
-
 def _invalidate_cached_bucket_feed(bucket_slug: str) -> None:
-    prefix = f"feed_{bucket_slug}_"
-    cleared = 0
-    consecutive_misses = 0
-
-    for page in range(1, FEED_CACHE_MAX_PAGES + 1):
-        cache_key = f"{prefix}{page}"
-        removed = _delete_cache_key(cache.delete, cache_key)
-        if removed:
-            cleared += 1
-            consecutive_misses = 0
-            continue
-
-        consecutive_misses += 1
-        if consecutive_misses >= FEED_CACHE_MAX_CONSECUTIVE_MISSES:
-            break
-
-    # Invalidate companion link-feed cache series
-    for page in range(1, FEED_CACHE_MAX_PAGES + 1):
-        cache_key = f"feed_links_{bucket_slug}_{page}"
-        _delete_cache_key(cache.delete, cache_key)
+    # One delete_many call lets remote backends drop every page in a single
+    # round trip. Probing page by page for a miss streak cannot stop early
+    # anyway, since FirestoreCache.delete reports a hit for absent keys.
+    pages = range(1, FEED_CACHE_MAX_PAGES + 1)
+    keys = [f"feed_{bucket_slug}_{page}" for page in pages]
+    keys += [f"feed_links_{bucket_slug}_{page}" for page in pages]
+    keys += [_feed_cursor_key(bucket_slug, page) for page in pages]
+    deleted = cache.delete_many(*keys)
 
     logger.info(
         "feed.cache.invalidated",
         extra={
             "bucket_slug": bucket_slug,
-            "removed_pages": cleared,
-            "scanned_pages": min(FEED_CACHE_MAX_PAGES, cleared + consecutive_misses),
+            "removed_keys": len(deleted or ()),
+            "requested_keys": len(keys),
         },
     )
 
 
+def _feed_cursor_key(bucket_slug: str, page: int) -> str:
+    return f"feed_cursor_{bucket_slug}_{page}"
+
+
+def _load_nearest_feed_cursor(bucket_slug: str, page: int) -> tuple[int, str | None]:
+    """Return the deepest cached ``(page, cursor)`` at or below ``page``.
+
+    Falls back to ``(1, None)``, the start of the bucket, when nothing is cached.
+    """
+    if page <= 1:
+        return 1, None
+    pages = range(2, min(page, FEED_CACHE_MAX_PAGES) + 1)
+    try:
+        cursors = cache.get_many(*(_feed_cursor_key(bucket_slug, p) for p in pages))
+    except Exception as exc:  # pragma: no cover - cache backend failures
+        logger.debug("Feed cursor lookup failed for %s: %s", bucket_slug, exc)
+        return 1, None
+    for cached_page, cursor in zip(reversed(pages), reversed(cursors)):
+        if cursor:
+            return cached_page, cursor
+    return 1, None
+
+
+def _store_feed_cursor(bucket_slug: str, page: int, cursor: str | None) -> None:
+    # Only pages the invalidator covers may be cached, or they could go stale.
+    if not cursor or page > FEED_CACHE_MAX_PAGES:
+        return
+    try:
+        cache.set(
+            _feed_cursor_key(bucket_slug, page),
+            cursor,
+            timeout=FEED_CURSOR_CACHE_SECONDS,
+        )
+    except Exception as exc:  # pragma: no cover - cache backend failures
+        logger.debug("Feed cursor store failed for %s: %s", bucket_slug, exc)
+
+
 def _resolve_bucket_slug(identifier: str | None) -> str | None:
     if not identifier:
         return None
@@ -136,13 +155,21 @@ def invalidate_feed_cache(sender, **extra) -> None:
 item_updated.connect(invalidate_feed_cache)
 
 
+_itunes_namespace_registered = False
+
+
 def _register_itunes_namespace():
+    global _itunes_namespace_registered
+    if _itunes_namespace_registered:
+        return
     try:
         from feedparser.util import FeedParserDict  # type: ignore
 
         FeedParserDict.keymap["itunes_author"] = "author"  # type: ignore[attr-defined]
     except Exception:  # pragma: no cover - feedparser optional
         pass
+    # A missing feedparser stays missing, so failures need no retry either.
+    _itunes_namespace_registered = True
 
 
 def _coerce_datetime(value):
@@ -164,11 +191,12 @@ def _coerce_datetime(value):
 
 
 def _build_entry_guid(bucket_slug: str, item, published_at: datetime | None) -> str:
-    """Construct a stable GUID for feed entries using the source URL and publish time when available."""
+    """Construct a stable GUID for feed entries using the source URL and publish time when available.
+
+    ``published_at`` must already be coerced with :func:`_coerce_datetime`.
+    """
     source = (getattr(item, "sourceUrl", None) or "").strip()
-    published_component = ""
-    if published_at:
-        published_component = _coerce_datetime(published_at).isoformat()
+    published_component = published_at.isoformat() if published_at else ""
     if source:
         base = f"{source}|{published_component}"
     else:
@@ -187,18 +215,46 @@ def _format_duration(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
 
-def _format_rfc822(dt: datetime) -> str:
-    coerced = _coerce_datetime(dt)
-    return coerced.strftime("%a, %d %b %Y %H:%M:%S %z")
-
-
 def _clean_text(value: str | None) -> str:
+    """Unescape entities, drop ``<...>`` tags and collapse whitespace."""
     if not value:
         return ""
-    text = html.unescape(value)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+    text = html.unescape(value) if "&" in value else value
+    if "<" not in text:
+        return " ".join(text.split())
+    # One forward scan with str.find replaces the tag regex. A tag needs at
+    # least one character between the brackets, so ``<>`` stays as text.
+    parts: list[str] = []
+    kept_from = 0
+    search_from = 0
+    while (start := text.find("<", search_from)) != -1:
+        end = text.find(">", start + 1)
+        if end == -1:
+            break
+        if end == start + 1:
+            search_from = end
+            continue
+        parts.append(text[kept_from:start])
+        kept_from = search_from = end + 1
+    parts.append(text[kept_from:])
+    return " ".join(" ".join(parts).split())
+
+
+# ``list_buckets`` is memoised, so it returns the same list object until the
+# bucket cache is invalidated; that identity versions the derived lookup.
+_bucket_lookup_memo: tuple[list[Any], dict[str, Any]] | None = None
+
+
+def _get_bucket_lookup() -> dict[str, Any]:
+    """Return bucket id -> bucket, rebuilt only when ``list_buckets`` changes."""
+    global _bucket_lookup_memo
+    buckets = list_buckets()
+    memo = _bucket_lookup_memo
+    if memo is not None and memo[0] is buckets:
+        return memo[1]
+    lookup = {b.id: b for b in buckets if getattr(b, "id", None)}
+    _bucket_lookup_memo = (buckets, lookup)
+    return lookup
 
 
 def _truncate(text: str, limit: int) -> str:
@@ -207,6 +263,7 @@ def _truncate(text: str, limit: int) -> str:
     return text[: limit - 1].rstrip() + "…"
 
 
+@lru_cache(maxsize=1024)
 def _guess_source_image(url: str | None) -> str | None:
     if not url:
         return None
@@ -217,12 +274,15 @@ def _guess_source_image(url: str | None) -> str | None:
 
 
 SUPPORTED_PODCAST_IMAGE_EXTENSIONS = (".jpg", ".png")
+_IMAGE_EXTENSION_SPAN = max(map(len, SUPPORTED_PODCAST_IMAGE_EXTENSIONS))
 
 
 def _is_supported_podcast_image_url(url: str | None) -> bool:
     if not url:
         return False
-    return url.lower().endswith(SUPPORTED_PODCAST_IMAGE_EXTENSIONS)
+    # Lower-case only the tail instead of copying the whole URL.
+    suffix = url[-_IMAGE_EXTENSION_SPAN:].lower()
+    return suffix.endswith(SUPPORTED_PODCAST_IMAGE_EXTENSIONS)
 
 
 def _choose_podcast_image_candidate(*candidates: str | None) -> str | None:
@@ -276,8 +336,10 @@ def _filter_items_by_days(items: Iterable[Any], days: int) -> list[Any]:
         )
         if not published:
             continue
-        published_dt = _coerce_datetime(published)
-        if published_dt >= cutoff:
+        # Firestore hands back aware datetimes, so only coerce the rest.
+        if not (isinstance(published, datetime) and published.tzinfo):
+            published = _coerce_datetime(published)
+        if published >= cutoff:
             filtered.append(item)
     return filtered
 
@@ -397,7 +459,7 @@ def build_public_feed_schema(metadata: dict[str, Any], items: list[Any]) -> str:
         "author": metadata.get("title"),
         "episode": episodes,
     }
-    return json.dumps(schema, ensure_ascii=False)
+    return json_codec.dumps(schema)
 
 
 class FeedGenerationError(Exception):
@@ -453,6 +515,53 @@ def build_public_feed_xml(
         )
 
 
+def _itunes_keywords_element(keywords: set[str]) -> bytes:
+    text = xml_escape(", ".join(sorted(keywords)))
+    return f"<itunes:keywords>{text}</itunes:keywords>".encode("utf-8")
+
+
+def _render_rss(
+    fg: FeedGenerator, feed_keywords: set[str], entry_keywords_map: list[set[str]]
+) -> bytes:
+    """Serialise ``fg`` to RSS bytes, adding sorted ``itunes:keywords`` elements."""
+    rss_bytes = fg.rss_str(pretty=FEED_PRETTY_PRINT)
+    if not feed_keywords and not any(entry_keywords_map):
+        return rss_bytes
+
+    # feedgen escapes all text, declares the ``itunes`` prefix on <rss> (the
+    # podcast extension is always loaded) and never nests items. The keywords
+    # can therefore be spliced in as the last child of each element without
+    # parsing and re-serialising the document.
+    parts: list[bytes] = []
+    # Items in a feed tend to share tag and bucket sets; sort, join and escape
+    # each distinct set once.
+    rendered: dict[frozenset[str], bytes] = {}
+    kept_from = 0
+    search_from = 0
+    # ``add_entry`` prepends, so <item> blocks come out in reverse insertion
+    # order; walk the keywords the same way to keep each set on its own item.
+    for keywords in reversed(entry_keywords_map):
+        item_end = rss_bytes.find(b"</item>", search_from)
+        if item_end == -1:
+            break
+        if keywords:
+            key = frozenset(keywords)
+            element = rendered.get(key)
+            if element is None:
+                element = rendered[key] = _itunes_keywords_element(keywords)
+            parts.append(rss_bytes[kept_from:item_end])
+            parts.append(element)
+            kept_from = item_end
+        search_from = item_end + len(b"</item>")
+    channel_end = rss_bytes.rfind(b"</channel>")
+    if feed_keywords and channel_end >= search_from:
+        parts.append(rss_bytes[kept_from:channel_end])
+        parts.append(_itunes_keywords_element(feed_keywords))
+        kept_from = channel_end
+    parts.append(rss_bytes[kept_from:])
+    return b"".join(parts)
+
+
 def _build_public_feed_xml(
     *,
     items: list[Any],
@@ -519,24 +628,32 @@ def _build_public_feed_xml(
 
     fg.link(href=feed_url, rel="self")
 
-    bucket_lookup = {b.id: b for b in list_buckets() if getattr(b, "id", None)}
+    bucket_lookup = _get_bucket_lookup()
     feed_keywords: set[str] = set()
-    entry_keywords_map: list[list[str]] = []
+    entry_keywords_map: list[set[str]] = []
     feed_last_updated: datetime | None = None
 
     for item in items:
         try:
+            # Public items may be partial objects, so optional attributes are
+            # read once here rather than re-probed with getattr below.
+            source_url = getattr(item, "sourceUrl", None)
+            audio_url = getattr(item, "audioUrl", None)
+            bucket_ids = getattr(item, "buckets", None) or []
             fe = fg.add_entry()
             pub_date = getattr(item, "publishedAt", None) or getattr(
                 item, "createdAt", None
             )
-            guid = _build_entry_guid("public", item, pub_date)
+            # Coerce each timestamp once; the GUID, pubDate, updated and
+            # lastBuildDate all reuse the same values.
+            published = _coerce_datetime(pub_date) if pub_date else None
+            guid = _build_entry_guid("public", item, published)
             fe.id(guid)
             fe.guid(guid, permalink=False)
             fe.title(getattr(item, "title", "Untitled Episode"))
 
-            if getattr(item, "sourceUrl", None):
-                fe.link(href=item.sourceUrl)
+            if source_url:
+                fe.link(href=source_url)
 
             summary_text = (
                 _clean_text(getattr(item, "summary_text", None))
@@ -547,20 +664,20 @@ def _build_public_feed_xml(
             summary_text = _truncate(summary_text, 400)
             fe.description(summary_text)
             fe.summary(summary_text)
-            fe.podcast.itunes_summary(summary_text)
-            fe.podcast.itunes_subtitle(_truncate(summary_text, 120))
+            itunes = fe.podcast
+            itunes.itunes_summary(summary_text)
+            itunes.itunes_subtitle(_truncate(summary_text, 120))
 
             if author:
-                fe.podcast.itunes_author(author)
+                itunes.itunes_author(author)
 
             bucket_stub = None
-            if getattr(item, "buckets", None):
-                for bucket_id in item.buckets or []:
-                    candidate = bucket_lookup.get(bucket_id)
-                    if candidate and candidate.name:
-                        fe.category(term=candidate.name)
-                        if not bucket_stub:
-                            bucket_stub = candidate
+            for bucket_id in bucket_ids:
+                candidate = bucket_lookup.get(bucket_id)
+                if candidate and candidate.name:
+                    fe.category(term=candidate.name)
+                    if not bucket_stub:
+                        bucket_stub = candidate
 
             episode_image = (
                 _select_episode_image(item, bucket_stub)
@@ -572,26 +689,24 @@ def _build_public_feed_xml(
                 )
             )
             if episode_image:
-                fe.podcast.itunes_image(episode_image)
+                itunes.itunes_image(episode_image)
 
-            if getattr(item, "audioUrl", None):
+            if audio_url:
                 mime_type = getattr(item, "audioMimeType", None) or "audio/mpeg"
                 fe.enclosure(
-                    url=item.audioUrl,
+                    url=audio_url,
                     length=str(getattr(item, "audioSizeBytes", None) or 0),
                     type=mime_type,
                 )
-            fe.podcast.itunes_duration(
+            itunes.itunes_duration(
                 _format_duration(getattr(item, "durationSeconds", None) or 0)
             )
 
-            pub_dt = (
-                pub_date
-                or getattr(item, "createdAt", None)
-                or datetime.now(timezone.utc)
-            )
-            fe.pubDate(_format_rfc822(pub_dt))
-            fe.updated(_coerce_datetime(getattr(item, "updatedAt", None) or pub_dt))
+            pub_dt = published or datetime.now(timezone.utc)
+            updated_at = getattr(item, "updatedAt", None)
+            current_updated = _coerce_datetime(updated_at) if updated_at else pub_dt
+            fe.pubDate(pub_dt)
+            fe.updated(current_updated)
 
             item_tags = getattr(item, "tags", None) or []
             for tag_value in item_tags:
@@ -600,19 +715,11 @@ def _build_public_feed_xml(
             keywords = set(item_tags)
             if bucket_stub and getattr(bucket_stub, "name", None):
                 keywords.add(bucket_stub.name)
-            keywords = sorted(keywords)
             entry_keywords_map.append(keywords)
-            if keywords:
-                feed_keywords.update(keywords)
+            feed_keywords |= keywords
 
-            current_updated = _coerce_datetime(
-                getattr(item, "updatedAt", None) or pub_dt
-            )
-            feed_last_updated = (
-                current_updated
-                if feed_last_updated is None
-                else max(feed_last_updated, current_updated)
-            )
+            if feed_last_updated is None or current_updated > feed_last_updated:
+                feed_last_updated = current_updated
         except Exception:  # pragma: no cover - resilience during feed build
             logger.exception(
                 "Error processing public feed item %s",
@@ -623,28 +730,7 @@ def _build_public_feed_xml(
 
     try:
         fg.lastBuildDate(feed_last_updated or datetime.now(timezone.utc))
-        rss_bytes = fg.rss_str(pretty=True)
-
-        if feed_keywords or any(entry_keywords_map):
-            itunes_ns = "http://www.itunes.com/dtds/podcast-1.0.dtd"
-            root = etree.fromstring(rss_bytes)
-            channel = root.find("channel")
-            if channel is not None:
-                if feed_keywords:
-                    for existing in channel.findall(f"{{{itunes_ns}}}keywords"):
-                        channel.remove(existing)
-                    kw_elem = etree.SubElement(channel, f"{{{itunes_ns}}}keywords")
-                    kw_elem.text = ", ".join(sorted(feed_keywords))
-                item_elems = channel.findall("item")
-                for elem, keywords in zip(item_elems, entry_keywords_map):
-                    if keywords:
-                        for existing in elem.findall(f"{{{itunes_ns}}}keywords"):
-                            elem.remove(existing)
-                        kw_elem = etree.SubElement(elem, f"{{{itunes_ns}}}keywords")
-                        kw_elem.text = ", ".join(keywords)
-            rss_bytes = etree.tostring(
-                root, encoding="utf-8", xml_declaration=True, pretty_print=True
-            )
+        rss_bytes = _render_rss(fg, feed_keywords, entry_keywords_map)
     except Exception:  # pragma: no cover - defensive handling
         logger.exception("Error finalising public RSS feed", exc_info=True)
         raise
@@ -703,7 +789,6 @@ def _generate_feed_for_bucket(
             raise FeedGenerationError(f"Bucket with slug '{bucket_slug}' not found.")
 
         list_items_fn = getattr(list_items, "__wrapped__", list_items)
-        cursor: Optional[str] = None
         bucket_filter_value = bucket.id or bucket.slug
         if not bucket_filter_value:
             logger.warning(
@@ -714,18 +799,21 @@ def _generate_feed_for_bucket(
                 f"Bucket '{bucket_slug}' is missing identifier metadata."
             )
 
-        if page > 1:
-            for _ in range(1, page):
-                _, cursor = list_items_fn(
-                    user_id=None,
-                    bucket_slug=bucket_filter_value,
-                    limit=FEED_ITEMS_PER_PAGE,
-                    cursor=cursor,
-                    include_archived=False,
-                    include_read=True,
-                )
-                if not cursor:
-                    raise FeedGenerationError("Requested feed page is out of range.")
+        # Resume from the deepest cached page cursor so deep pages do not
+        # re-walk every earlier page through Firestore.
+        start_page, cursor = _load_nearest_feed_cursor(bucket_slug, page)
+        for walk_page in range(start_page, page):
+            _, cursor = list_items_fn(
+                user_id=None,
+                bucket_slug=bucket_filter_value,
+                limit=FEED_ITEMS_PER_PAGE,
+                cursor=cursor,
+                include_archived=False,
+                include_read=True,
+            )
+            if not cursor:
+                raise FeedGenerationError("Requested feed page is out of range.")
+            _store_feed_cursor(bucket_slug, walk_page + 1, cursor)
 
         try:
             items, next_cursor = list_items_fn(
@@ -740,6 +828,7 @@ def _generate_feed_for_bucket(
             _handle_missing_index(exc)
 
         has_next = bool(next_cursor)
+        _store_feed_cursor(bucket_slug, page + 1, next_cursor)
         initial_items_count = len(items)
 
         fg = FeedGenerator()
@@ -801,18 +890,21 @@ def _generate_feed_for_bucket(
         if has_next:
             fg.link(href=f"{feed_base_url}?page={page + 1}", rel="next")
 
-        bucket_lookup = {b.id: b for b in list_buckets() if getattr(b, "id", None)}
+        bucket_lookup = _get_bucket_lookup()
         feed_keywords: set[str] = set()
         feed_last_updated: datetime | None = None
-        entry_keywords_map: list[list[str]] = []
+        entry_keywords_map: list[set[str]] = []
 
         for item in items:
             try:
-                if require_audio and not getattr(item, "audioUrl", None):
+                audio_url = getattr(item, "audioUrl", None)
+                if require_audio and not audio_url:
                     continue
                 fe = fg.add_entry()
                 pub_date = item.publishedAt or item.createdAt
-                guid = _build_entry_guid(bucket_slug, item, pub_date)
+                # Coerced once, as in the public feed loop.
+                published = _coerce_datetime(pub_date) if pub_date else None
+                guid = _build_entry_guid(bucket_slug, item, published)
                 fe.id(guid)
                 fe.guid(guid, permalink=False)
                 fe.title(item.title)
@@ -827,28 +919,32 @@ def _generate_feed_for_bucket(
                 summary_text = _truncate(summary_text, 400)
                 fe.description(summary_text)
                 fe.summary(summary_text)
-                fe.podcast.itunes_summary(summary_text)
-                fe.podcast.itunes_subtitle(_truncate(summary_text, 120))
-                fe.podcast.itunes_author(
+                itunes = fe.podcast
+                itunes.itunes_summary(summary_text)
+                itunes.itunes_subtitle(_truncate(summary_text, 120))
+                itunes.itunes_author(
                     getattr(item, "author", None) or bucket.rss_author_name
                 )
 
                 episode_image = _select_episode_image(item, bucket)
                 if episode_image:
-                    fe.podcast.itunes_image(episode_image)
+                    itunes.itunes_image(episode_image)
 
-                if item.audioUrl:
+                if audio_url:
                     mime_type = getattr(item, "audioMimeType", None) or "audio/mpeg"
                     fe.enclosure(
-                        url=item.audioUrl,
+                        url=audio_url,
                         length=str(item.audioSizeBytes or 0),
                         type=mime_type,
                     )
-                fe.podcast.itunes_duration(_format_duration(item.durationSeconds or 0))
+                itunes.itunes_duration(_format_duration(item.durationSeconds or 0))
 
-                pub_dt = pub_date or item.createdAt
-                fe.pubDate(_format_rfc822(pub_dt))
-                fe.updated(_coerce_datetime(item.updatedAt or pub_dt))
+                pub_dt = published or datetime.now(timezone.utc)
+                current_updated = (
+                    _coerce_datetime(item.updatedAt) if item.updatedAt else pub_dt
+                )
+                fe.pubDate(pub_dt)
+                fe.updated(current_updated)
 
                 item_tags = getattr(item, "tags", []) or []
                 item_bucket_names: list[str] = []
@@ -860,17 +956,12 @@ def _generate_feed_for_bucket(
                 for tag in item_tags:
                     fe.category(term=tag)
 
-                keywords = sorted({*item_tags, *item_bucket_names})
+                keywords = {*item_tags, *item_bucket_names}
                 entry_keywords_map.append(keywords)
-                if keywords:
-                    feed_keywords.update(keywords)
-
-                current_updated = _coerce_datetime(item.updatedAt or pub_dt)
-                feed_last_updated = (
-                    current_updated
-                    if feed_last_updated is None
-                    else max(feed_last_updated, current_updated)
-                )
+                feed_keywords |= keywords
+
+                if feed_last_updated is None or current_updated > feed_last_updated:
+                    feed_last_updated = current_updated
                 emitted_count += 1
             except Exception:  # pragma: no cover - resilience during feed build
                 logger.exception(
@@ -883,27 +974,7 @@ def _generate_feed_for_bucket(
         try:
             fg.lastBuildDate(feed_last_updated or datetime.now(timezone.utc))
 
-            rss_bytes = fg.rss_str(pretty=True)
-            if feed_keywords or any(entry_keywords_map):
-                itunes_ns = "http://www.itunes.com/dtds/podcast-1.0.dtd"
-                root = etree.fromstring(rss_bytes)
-                channel = root.find("channel")
-                if channel is not None:
-                    if feed_keywords:
-                        for existing in channel.findall(f"{{{itunes_ns}}}keywords"):
-                            channel.remove(existing)
-                        kw_elem = etree.SubElement(channel, f"{{{itunes_ns}}}keywords")
-                        kw_elem.text = ", ".join(sorted(feed_keywords))
-                    item_elems = channel.findall("item")
-                    for elem, keywords in zip(item_elems, entry_keywords_map):
-                        if keywords:
-                            for existing in elem.findall(f"{{{itunes_ns}}}keywords"):
-                                elem.remove(existing)
-                            kw_elem = etree.SubElement(elem, f"{{{itunes_ns}}}keywords")
-                            kw_elem.text = ", ".join(keywords)
-                rss_bytes = etree.tostring(
-                    root, encoding="utf-8", xml_declaration=True, pretty_print=True
-                )
+            rss_bytes = _render_rss(fg, feed_keywords, entry_keywords_map)
         except Exception:  # pragma: no cover - defensive handling
             logger.exception(
                 "Error finalizing RSS feed for bucket %s", bucket_slug, exc_info=True
@@ -1,14 +1,19 @@
+import itertools
 import logging
 import os
 import random
+import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
-from typing import Callable, Iterator, Optional
+from types import MappingProxyType
+from typing import Callable, Iterator, Mapping, Optional
 
 import requests
 from requests.adapters import HTTPAdapter
+from requests.compat import chardet  # type: ignore[attr-defined]
 from urllib3.util.retry import Retry
 
 try:
@@ -50,6 +55,11 @@ HYBRID_REFERERS = [
     if value.strip()
 ]
 HYBRID_PROFILE_LIMIT = int(os.getenv("FETCH_HYBRID_PROFILE_LIMIT", "6"))
+HYBRID_MAX_WORKERS = int(os.getenv("FETCH_HYBRID_MAX_WORKERS", "3"))
+FETCH_POOL_CONNECTIONS = int(os.getenv("FETCH_POOL_CONNECTIONS", "32"))
+FETCH_POOL_MAXSIZE = int(os.getenv("FETCH_POOL_MAXSIZE", "64"))
+FETCH_MAX_BODY_BYTES = int(os.getenv("FETCH_MAX_BODY_BYTES", str(10 * 1024 * 1024)))
+_BODY_CHUNK_BYTES = 64 * 1024
 TRUNCATION_MIN_LENGTH = int(os.getenv("PARSER_TRUNCATION_MIN_LENGTH", "500"))
 BLOCKING_PHRASES = [
     phrase.strip().lower()
@@ -59,6 +69,14 @@ BLOCKING_PHRASES = [
     ).split(",")
     if phrase.strip()
 ]
+# One case-insensitive alternation scans the text once, without a lowered copy.
+_BLOCKING_RE = (
+    re.compile(
+        "|".join(re.escape(phrase) for phrase in BLOCKING_PHRASES), re.IGNORECASE
+    )
+    if BLOCKING_PHRASES
+    else None
+)
 
 TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
 TRANSIENT_STATUS_CODES.update(range(505, 600))
@@ -67,10 +85,10 @@ SleepFn = Callable[[float], None]
 
 
 def _unique_profiles(profiles: list[dict[str, str]]) -> list[dict[str, str]]:
-    seen: set[tuple[tuple[str, str], ...]] = set()
+    seen: set[frozenset[tuple[str, str]]] = set()
     unique: list[dict[str, str]] = []
     for profile in profiles:
-        key = tuple(sorted(profile.items()))
+        key = frozenset(profile.items())
         if key in seen:
             continue
         seen.add(key)
@@ -101,9 +119,16 @@ def _compute_hybrid_profiles() -> list[dict[str, str]]:
     return unique[:HYBRID_PROFILE_LIMIT]
 
 
-_HYBRID_HEADER_PROFILES = _compute_hybrid_profiles()
+# Read-only so callers can share the profiles without defensive copies.
+_HYBRID_HEADER_PROFILES: tuple[Mapping[str, str], ...] = tuple(
+    MappingProxyType(profile) for profile in _compute_hybrid_profiles()
+)
 _session_lock = threading.Lock()
 _session: requests.Session | None = None
+# Round-robin rather than random header picks keep consecutive requests
+# reproducible and friendly to caches that vary on Accept/Accept-Language.
+# ``next()`` on a count is atomic under the GIL, so no lock is needed.
+_header_rotation = itertools.count()
 
 
 def _retry_adapter() -> HTTPAdapter:
@@ -113,7 +138,11 @@ def _retry_adapter() -> HTTPAdapter:
         status_forcelist=sorted(TRANSIENT_STATUS_CODES),
         allowed_methods=("GET", "HEAD", "OPTIONS"),
     )
-    return HTTPAdapter(max_retries=retry, pool_connections=16, pool_maxsize=32)
+    return HTTPAdapter(
+        max_retries=retry,
+        pool_connections=FETCH_POOL_CONNECTIONS,
+        pool_maxsize=FETCH_POOL_MAXSIZE,
+    )
 
 
 def _get_session() -> requests.Session:
@@ -132,15 +161,16 @@ def _get_session() -> requests.Session:
 
 
 def _build_headers(user_agent: Optional[str]) -> dict[str, str]:
+    index = next(_header_rotation)
     headers = {
         "User-Agent": user_agent or USER_AGENT,
         "Accept-Language": (
-            random.choice(ACCEPT_LANG_OPTIONS)
+            ACCEPT_LANG_OPTIONS[index % len(ACCEPT_LANG_OPTIONS)]
             if ACCEPT_LANG_OPTIONS
             else "en-US,en;q=0.9"
         ),
         "Accept": (
-            random.choice(ACCEPT_HEADER_OPTIONS)
+            ACCEPT_HEADER_OPTIONS[index % len(ACCEPT_HEADER_OPTIONS)]
             if ACCEPT_HEADER_OPTIONS
             else "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
         ),
@@ -166,7 +196,50 @@ def _retry_wait_seconds(
                 return min(delta, FETCH_MAX_BACKOFF_SECONDS)
         except (TypeError, ValueError):
             logger.debug("Failed to parse Retry-After header: %s", retry_after)
-    return min(fallback, FETCH_MAX_BACKOFF_SECONDS)
+    # Equal jitter: concurrent workers backing off from the same 429/503 spread
+    # out instead of retrying in lockstep. Retry-After above stays exact.
+    capped = min(fallback, FETCH_MAX_BACKOFF_SECONDS)
+    return random.uniform(capped / 2, capped)
+
+
+def _read_body(response: requests.Response) -> tuple[bytes, bool]:
+    """Read a streamed body up to ``FETCH_MAX_BODY_BYTES``; report truncation."""
+    buffer = bytearray()
+    truncated = False
+    try:
+        for chunk in response.iter_content(chunk_size=_BODY_CHUNK_BYTES):
+            buffer += chunk
+            if FETCH_MAX_BODY_BYTES > 0 and len(buffer) >= FETCH_MAX_BODY_BYTES:
+                truncated = len(buffer) > FETCH_MAX_BODY_BYTES
+                del buffer[FETCH_MAX_BODY_BYTES:]
+                break
+    finally:
+        response.close()
+    return bytes(buffer), truncated
+
+
+def _decode_body(body: bytes, encoding: Optional[str]) -> str:
+    # Same resolution as ``Response.text``: the header charset when there is
+    # one, else ``apparent_encoding`` sniffed from the buffered bytes (the
+    # streamed response never buffered ``content`` itself), then UTF-8 for
+    # codecs Python does not know.
+    if not encoding and body and chardet is not None:
+        encoding = chardet.detect(body)["encoding"]
+    try:
+        return body.decode(encoding or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def _backoff_sleep(
+    wait: float, sleep: SleepFn, cancel: Optional[threading.Event]
+) -> None:
+    # With the default sleep, wait on the cancel event instead so an abandoned
+    # fetch wakes up and stops retrying rather than finishing its backoff.
+    if cancel is not None and sleep is time.sleep:
+        cancel.wait(wait)
+    else:
+        sleep(wait)
 
 
 def fetch_with_resilience(
@@ -177,6 +250,7 @@ def fetch_with_resilience(
     user_agent: Optional[str] = None,
     sleep: SleepFn = time.sleep,
     extra_headers: Optional[dict[str, str]] = None,
+    cancel: Optional[threading.Event] = None,
 ) -> dict:
     attempt = 0
     backoff = FETCH_BACKOFF_FACTOR
@@ -184,6 +258,8 @@ def fetch_with_resilience(
     started = time.perf_counter()
 
     while True:
+        if cancel is not None and cancel.is_set():
+            return {"error": "Fetch cancelled"}
         attempt += 1
         headers = _build_headers(user_agent)
         if extra_headers:
@@ -195,6 +271,8 @@ def fetch_with_resilience(
                 headers=headers,
                 timeout=timeout or REQUEST_TIMEOUT_SECONDS,
                 allow_redirects=True,
+                # Streamed so oversized bodies are capped instead of buffered whole.
+                stream=True,
             )
         except requests.RequestException as exc:
             logger.warning(
@@ -208,7 +286,7 @@ def fetch_with_resilience(
                 "fetch.retry_sleep",
                 extra={"url": url, "attempt": attempt, "sleep_seconds": wait},
             )
-            sleep(wait)
+            _backoff_sleep(wait, sleep, cancel)
             backoff = min(backoff * 2, FETCH_MAX_BACKOFF_SECONDS)
             continue
 
@@ -221,6 +299,7 @@ def fetch_with_resilience(
                     "attempt": attempt,
                 },
             )
+            response.close()
             if attempt > FETCH_MAX_RETRIES:
                 return {"error": f"Failed to fetch URL: HTTP {response.status_code}"}
             wait = _retry_wait_seconds(response, backoff)
@@ -228,17 +307,45 @@ def fetch_with_resilience(
                 "fetch.retry_sleep",
                 extra={"url": url, "attempt": attempt, "sleep_seconds": wait},
             )
-            sleep(wait)
+            _backoff_sleep(wait, sleep, cancel)
             backoff = min(backoff * 2, FETCH_MAX_BACKOFF_SECONDS)
             continue
 
         if response.status_code >= 400:
+            response.close()
             logger.error("Non-retriable status %s for %s", response.status_code, url)
             return {"error": f"Failed to fetch URL: HTTP {response.status_code}"}
 
+        try:
+            body, body_truncated = _read_body(response)
+        except requests.RequestException as exc:
+            # Connection resets and chunked-encoding errors mid-body are as
+            # transient as failing to connect, so they share its backoff.
+            logger.warning(
+                "fetch.body_read_failed",
+                extra={"url": url, "attempt": attempt, "error": str(exc)},
+            )
+            if attempt > FETCH_MAX_RETRIES:
+                return {"error": f"Failed to fetch URL: {exc}"}
+            wait = _retry_wait_seconds(None, backoff)
+            logger.debug(
+                "fetch.retry_sleep",
+                extra={"url": url, "attempt": attempt, "sleep_seconds": wait},
+            )
+            _backoff_sleep(wait, sleep, cancel)
+            backoff = min(backoff * 2, FETCH_MAX_BACKOFF_SECONDS)
+            continue
+        if body_truncated:
+            logger.warning(
+                "fetch.body_truncated",
+                extra={"url": url, "max_bytes": FETCH_MAX_BODY_BYTES},
+            )
+
         elapsed_ms = int((time.perf_counter() - started) * 1000)
         payload = {
-            "html": response.text,
+            "html": _decode_body(body, response.encoding),
+            # Raw bytes for JSON callers, which can parse without decoding to str.
+            "body": body,
             "final_url": response.url,
             "status_code": response.status_code,
             "response_headers": dict(response.headers),
@@ -280,13 +387,14 @@ def is_likely_truncated(text: Optional[str]) -> bool:
     stripped = text.strip()
     if len(stripped) < TRUNCATION_MIN_LENGTH:
         return True
-    lowered = stripped.lower()
-    return any(phrase in lowered for phrase in BLOCKING_PHRASES)
+    if _BLOCKING_RE is None:
+        return False
+    return _BLOCKING_RE.search(stripped) is not None
 
 
-def get_hybrid_header_profiles() -> list[dict[str, str]]:
+def get_hybrid_header_profiles() -> tuple[Mapping[str, str], ...]:
     """Expose the deterministic header profiles used for hybrid retries."""
-    return [profile.copy() for profile in _HYBRID_HEADER_PROFILES]
+    return _HYBRID_HEADER_PROFILES
 
 
 def hybrid_fetch_attempts(
@@ -300,13 +408,45 @@ def hybrid_fetch_attempts(
     if not _HYBRID_HEADER_PROFILES:
         return
 
-    for profile in _HYBRID_HEADER_PROFILES:
-        attempt_headers = profile.copy()
-        yield attempt_headers, fetch_with_resilience(
-            url,
-            session=session,
-            timeout=timeout,
-            user_agent=user_agent,
-            sleep=sleep,
-            extra_headers=attempt_headers,
-        )
+    workers = min(HYBRID_MAX_WORKERS, len(_HYBRID_HEADER_PROFILES))
+    if workers <= 1:
+        for profile in _HYBRID_HEADER_PROFILES:
+            attempt_headers = dict(profile)
+            yield attempt_headers, fetch_with_resilience(
+                url,
+                session=session,
+                timeout=timeout,
+                user_agent=user_agent,
+                sleep=sleep,
+                extra_headers=attempt_headers,
+            )
+        return
+
+    # Probe profiles concurrently and yield in completion order so callers that
+    # stop at the first good result wait for the fastest profile, not the sum.
+    executor = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="hybrid-fetch"
+    )
+    cancel = threading.Event()
+    futures = {}
+    try:
+        for profile in _HYBRID_HEADER_PROFILES:
+            attempt_headers = dict(profile)
+            future = executor.submit(
+                fetch_with_resilience,
+                url,
+                session=session,
+                timeout=timeout,
+                user_agent=user_agent,
+                sleep=sleep,
+                extra_headers=attempt_headers,
+                cancel=cancel,
+            )
+            futures[future] = attempt_headers
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # Once the caller has what it needs, drop queued probes and tell running
+        # ones to stop retrying; a request already on the wire still finishes.
+        cancel.set()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import re
 from datetime import datetime, timezone
-from typing import Any, Callable, Iterable
+from functools import lru_cache
+from typing import Any, Callable
 
 from google.api_core.exceptions import FailedPrecondition
 
@@ -18,7 +19,7 @@ def ensure_db_client(
         )
 
 
-def clear_cached_functions(*functions: Iterable[Callable]) -> None:
+def clear_cached_functions(*functions: Callable) -> None:
     """Clears cachetools caches for the provided callables, if present."""
     for fn in functions:
         cache_obj = getattr(fn, "cache", None)
@@ -52,16 +53,23 @@ def normalise_timestamp(value: Any) -> datetime | None:
             converted = converted.replace(tzinfo=timezone.utc)
         return converted
     if isinstance(value, str):
-        candidate = value.strip()
-        if not candidate:
-            return None
-        if candidate.endswith("Z"):
-            candidate = candidate[:-1] + "+00:00"
-        try:
-            converted = datetime.fromisoformat(candidate)
-        except ValueError:
-            return None
-        if converted.tzinfo is None:
-            converted = converted.replace(tzinfo=timezone.utc)
-        return converted
+        return _parse_iso_timestamp(value)
     return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_timestamp(value: str) -> datetime | None:
+    # List renders parse the same stored strings repeatedly; datetimes are
+    # immutable, so cached results are safe to share.
+    candidate = value.strip()
+    if not candidate:
+        return None
+    if candidate.endswith("Z"):
+        candidate = candidate[:-1] + "+00:00"
+    try:
+        converted = datetime.fromisoformat(candidate)
+    except ValueError:
+        return None
+    if converted.tzinfo is None:
+        converted = converted.replace(tzinfo=timezone.utc)
+    return converted
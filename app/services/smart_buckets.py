@@ -1,10 +1,13 @@
 import os
+from typing import cast
+
 from google.cloud import firestore  # type: ignore[attr-defined]
 from google.cloud.exceptions import GoogleCloudError
 from app.models.smart_bucket import SmartBucket, SmartBucketRule
 from app.models.item import Item
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
+from app.services import firestore_client
 from app.services.firestore_helpers import (
     ensure_db_client,
     normalise_timestamp,
@@ -12,12 +15,8 @@ from app.services.firestore_helpers import (
 
 logger = logging.getLogger(__name__)
 
-# Initialize the Firestore client once at the module level.
-try:
-    db = firestore.Client(project=os.getenv("GOOGLE_CLOUD_PROJECT"))
-except Exception as e:
-    logger.critical(f"Failed to initialize Firestore client: {e}")
-    db = None
+# Cast once at import; a missing client is reported by ``_require_db()``.
+db = cast(firestore.Client, firestore_client.db)
 
 
 class FirestoreError(Exception):
@@ -87,8 +86,9 @@ def create_smart_bucket(smart_bucket: SmartBucket) -> str:
             os.getenv("FIRESTORE_COLLECTION_SMART_BUCKETS")
         ).document()
         smart_bucket_data = smart_bucket.__dict__
-        smart_bucket_data["createdAt"] = datetime.utcnow()
-        smart_bucket_data["updatedAt"] = datetime.utcnow()
+        now = datetime.now(timezone.utc)
+        smart_bucket_data["createdAt"] = now
+        smart_bucket_data["updatedAt"] = now
         smart_bucket_data["rules"] = [rule.__dict__ for rule in smart_bucket.rules]
         smart_bucket_ref.set(smart_bucket_data)
         return smart_bucket_ref.id
@@ -104,7 +104,7 @@ def update_smart_bucket(smart_bucket_id: str, update_data: dict):
         smart_bucket_ref = db.collection(
             os.getenv("FIRESTORE_COLLECTION_SMART_BUCKETS")
         ).document(smart_bucket_id)
-        update_data["updatedAt"] = datetime.utcnow()
+        update_data["updatedAt"] = datetime.now(timezone.utc)
         if "rules" in update_data:
             update_data["rules"] = [rule.__dict__ for rule in update_data["rules"]]
         smart_bucket_ref.update(update_data)
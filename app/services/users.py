@@ -1,21 +1,19 @@
 import logging
 import os
 from datetime import datetime, timedelta, timezone
+from typing import cast
 
 from google.cloud import firestore  # type: ignore[attr-defined]
 from google.cloud.exceptions import GoogleCloudError
 
 from app.models.user import User
+from app.services import firestore_client
 from app.services.firestore_helpers import ensure_db_client
 
 logger = logging.getLogger(__name__)
 
-# Initialize the Firestore client once at the module level.
-try:
-    db = firestore.Client(project=os.getenv("GOOGLE_CLOUD_PROJECT"))
-except Exception as e:
-    logger.critical(f"Failed to initialize Firestore client: {e}")
-    db = None
+# Narrowed once for type checkers; ``_require_db()`` raises if it is missing.
+db = cast(firestore.Client, firestore_client.db)
 
 
 class FirestoreError(Exception):
@@ -7,6 +7,9 @@ from datetime import datetime, timedelta, timezone
 from flask_caching.backends.base import BaseCache
 from google.cloud.firestore import Client
 
+# Firestore rejects write batches with more than 500 operations.
+_MAX_BATCH_WRITES = 500
+
 
 class FirestoreCache(BaseCache):
     """A Flask-Caching backend that uses Google Cloud Firestore.
@@ -88,6 +91,15 @@ class FirestoreCache(BaseCache):
         doc_ref.delete()
         return True
 
+    def delete_many(self, *keys: str) -> list[str]:
+        """Delete several keys using batched writes rather than one RPC each."""
+        for start in range(0, len(keys), _MAX_BATCH_WRITES):
+            batch = self._client.batch()
+            for key in keys[start : start + _MAX_BATCH_WRITES]:
+                batch.delete(self.collection.document(key))
+            batch.commit()
+        return list(keys)
+
     def has(self, key: str) -> bool:
         """Check if a key exists in the cache."""
         return self.collection.document(key).get().exists
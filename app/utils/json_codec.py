@@ -0,0 +1,29 @@
+"""JSON helpers that prefer ``orjson`` and fall back to the standard library."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+# ``orjson.JSONDecodeError`` subclasses ``json.JSONDecodeError``, so callers can
+# keep catching the stdlib exception regardless of which backend is active.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: str | bytes | bytearray) -> Any:
+    """Deserialise JSON text or UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialise ``obj`` to compact JSON text; raises ``TypeError`` when unsupported."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
@@ -56,7 +56,7 @@ def clean_text(raw_text: str | None) -> str:
     if not raw_text:
         return ""
 
-    text = html.unescape(raw_text)
+    text = html.unescape(raw_text) if "&" in raw_text else raw_text
     text = unicodedata.normalize("NFKC", text)
     text = text.replace("\r\n", "\n").replace("\r", "\n")
     text = text.replace("\u00a0", " ")
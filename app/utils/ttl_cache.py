@@ -0,0 +1,79 @@
+"""Thread-safe TTL memoisation with lock-free cache hits."""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+_MISSING = object()
+_KWARGS_MARK = object()
+
+
+class TTLMemo:
+    """Bounded TTL cache whose hits never take a lock.
+
+    Entries map a call key to ``(value, monotonic_expiry)``. Lookups only read
+    the dict, which is atomic under the GIL; inserts, evictions and clears
+    serialise on a lock so the insertion order used for oldest-first eviction
+    stays consistent.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: dict[Hashable, tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return _MISSING
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (value, expires)
+            while len(self._data) > self.maxsize:
+                del self._data[next(iter(self._data))]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _make_key(args: tuple, kwargs: dict) -> Hashable:
+    if not kwargs:
+        return args
+    return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+
+
+def ttl_cache(maxsize: int, ttl: float) -> Callable[[Callable], Callable]:
+    """Memoise a function for ``ttl`` seconds, keeping at most ``maxsize`` results.
+
+    The wrapper exposes the backing :class:`TTLMemo` as ``.cache`` so
+    ``clear_cached_functions`` can invalidate it, like a cachetools ``@cached``.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        cache = TTLMemo(maxsize, ttl)
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = _make_key(args, kwargs)
+            value = cache.get(key)
+            if value is _MISSING:
+                value = fn(*args, **kwargs)
+                cache.set(key, value)
+            return value
+
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -22,24 +22,37 @@ def test_fallback_tags_honors_frequency_and_limit(monkeypatch):
 
 
 def test_maybe_schedule_enrichment_skips_when_enriched(monkeypatch):
-    monkeypatch.setenv("ENABLE_SUMMARY", "true")
-    monkeypatch.setenv("ENABLE_AUTO_TAGS", "true")
+    monkeypatch.setattr(ai_enrichment, "_SUMMARY_ENABLED", True)
+    monkeypatch.setattr(ai_enrichment, "_AUTO_TAG_ENABLED", True)
 
-    submitted = []
-
-    def fake_submit(*args, **kwargs):
-        submitted.append((args, kwargs))
+    scheduled = []
 
     monkeypatch.setattr(
         ai_enrichment.items_service,
         "get_item",
         lambda _: SimpleNamespace(summary_text="done", auto_tags=["tag"]),
     )
-    monkeypatch.setattr(ai_enrichment._executor, "submit", fake_submit)
+    monkeypatch.setattr(ai_enrichment, "_schedule", scheduled.append)
 
     ai_enrichment.maybe_schedule_enrichment("item-123", "Some article text", "cid-1")
 
-    assert submitted == []
+    assert scheduled == []
+
+
+def test_maybe_schedule_enrichment_skips_lookup_for_known_items(monkeypatch):
+    monkeypatch.setattr(ai_enrichment, "_SUMMARY_ENABLED", True)
+    monkeypatch.setattr(ai_enrichment, "_AUTO_TAG_ENABLED", True)
+    monkeypatch.setattr(ai_enrichment, "_enriched_items", {"item-456": True})
+
+    lookups = []
+    scheduled = []
+    monkeypatch.setattr(ai_enrichment.items_service, "get_item", lookups.append)
+    monkeypatch.setattr(ai_enrichment, "_schedule", scheduled.append)
+
+    ai_enrichment.maybe_schedule_enrichment("item-456", "Some article text", "cid-2")
+
+    assert lookups == []
+    assert scheduled == []
 
 
 def test_parse_structured_response_handles_candidate_list(monkeypatch):
@@ -51,3 +64,17 @@ def test_parse_structured_response_handles_candidate_list(monkeypatch):
 
     assert summary == "Insightful overview"
     assert tags == ["AI", "Data"]
+
+
+def test_parse_structured_response_rejects_truncated_payload():
+    raw = '{"summary": "Cut off mid-sentence", "tags": ["AI"'
+
+    assert ai_enrichment._parse_structured_response(raw) is None
+
+
+def test_fallback_tags_breaks_frequency_ties_alphabetically(monkeypatch):
+    monkeypatch.setattr(ai_enrichment, "_TAG_LIMIT", 3)
+
+    tags = ai_enrichment._fallback_tags("zeta alpha zeta alpha mango")
+
+    assert tags == ["Alpha", "Zeta", "Mango"]
@@ -1,5 +1,8 @@
+import asyncio
 import json
+import threading
 import time
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
 import pytest
@@ -13,8 +16,18 @@ class FakeResponse:
     ):
         self.status_code = status_code
         self.text = text
+        self.content = text.encode("utf-8")
         self.url = url
         self.headers = headers or {}
+        self.encoding = "utf-8"
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def close(self):
+        self.closed = True
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -28,7 +41,7 @@ class FakeSession:
         self._responses = responses
         self.calls = []
 
-    def get(self, url, headers, timeout, allow_redirects):
+    def get(self, url, headers, timeout, allow_redirects, stream=False):
         call_number = len(self.calls)
         self.calls.append(SimpleNamespace(url=url, headers=headers, timeout=timeout))
         response = self._responses[call_number]
@@ -52,6 +65,7 @@ def test_fetch_with_resilience_retries_and_succeeds():
     )
 
     assert result["html"] == "ok"
+    assert result["body"] == b"ok"
     assert session.calls and len(session.calls) == 2
     assert waits, "Expected at least one backoff sleep"
 
@@ -76,6 +90,145 @@ def test_fetch_with_resilience_honors_retry_after_header():
     assert waits[0] == pytest.approx(1.0)
 
 
+def test_fetch_with_resilience_caps_streamed_body(monkeypatch):
+    monkeypatch.setattr(fetch, "FETCH_MAX_BODY_BYTES", 5)
+    monkeypatch.setattr(fetch, "_BODY_CHUNK_BYTES", 2)
+    response = FakeResponse(text="abcdefghij", url="https://example.com/big")
+
+    result = fetch.fetch_with_resilience(
+        "https://example.com/big", session=FakeSession([response])
+    )
+
+    assert result["body"] == b"abcde"
+    assert result["html"] == "abcde"
+    assert response.closed
+
+
+def test_fetch_with_resilience_retries_body_read_errors():
+    from requests.exceptions import ChunkedEncodingError
+
+    class BrokenResponse(FakeResponse):
+        def iter_content(self, chunk_size=1):
+            yield b"par"
+            raise ChunkedEncodingError("connection reset")
+
+    broken = BrokenResponse(text="partial")
+    session = FakeSession([broken, FakeResponse(text="whole")])
+    waits = []
+
+    result = fetch.fetch_with_resilience(
+        "https://example.com/article", session=session, sleep=waits.append
+    )
+
+    assert result["html"] == "whole"
+    assert len(session.calls) == 2
+    assert len(waits) == 1
+    assert broken.closed
+
+
+def test_fetch_with_resilience_sniffs_missing_encoding():
+    text = "Café crème brûlée à la française, déjà vu. " * 20
+    response = FakeResponse(url="https://example.com/latin")
+    response.content = text.encode("latin-1")
+    response.encoding = None
+
+    result = fetch.fetch_with_resilience(
+        "https://example.com/latin", session=FakeSession([response])
+    )
+
+    assert result["html"] == text
+
+
+def test_retry_wait_seconds_jitters_fallback_backoff(monkeypatch):
+    monkeypatch.setattr(fetch, "FETCH_MAX_BACKOFF_SECONDS", 4.0)
+
+    waits = {fetch._retry_wait_seconds(None, 2.0) for _ in range(50)}
+
+    assert all(1.0 <= wait <= 2.0 for wait in waits)
+    assert len(waits) > 1
+    assert fetch._retry_wait_seconds(None, 10.0) <= 4.0
+
+
+def test_build_headers_rotates_header_options(monkeypatch):
+    monkeypatch.setattr(fetch, "ACCEPT_LANG_OPTIONS", ["en-US", "en-GB"])
+    monkeypatch.setattr(fetch, "ACCEPT_HEADER_OPTIONS", ["text/html"])
+    monkeypatch.setattr(fetch, "_header_rotation", iter(range(4)))
+
+    languages = [fetch._build_headers(None)["Accept-Language"] for _ in range(4)]
+
+    assert languages == ["en-US", "en-GB", "en-US", "en-GB"]
+
+
+def test_is_likely_truncated_flags_blocking_phrases():
+    body = "word " * 200
+
+    assert not fetch.is_likely_truncated(body)
+    assert fetch.is_likely_truncated(body + "Subscribe to read the full story")
+    assert fetch.is_likely_truncated("short")
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_hybrid_fetch_attempts_pairs_each_profile_with_its_result(monkeypatch, workers):
+    profiles = [{"Accept-Language": "en-US"}, {"Referer": "https://a.example/"}]
+    monkeypatch.setattr(fetch, "_HYBRID_HEADER_PROFILES", profiles)
+    monkeypatch.setattr(fetch, "HYBRID_MAX_WORKERS", workers)
+
+    def fake_fetch(url, *, extra_headers, **_kwargs):
+        return {"html": repr(sorted(extra_headers.items())), "final_url": url}
+
+    monkeypatch.setattr(fetch, "fetch_with_resilience", fake_fetch)
+
+    attempts = list(fetch.hybrid_fetch_attempts("https://example.com/article"))
+
+    assert len(attempts) == len(profiles)
+    for headers, result in attempts:
+        assert result["html"] == repr(sorted(headers.items()))
+    assert sorted(map(repr, (h for h, _ in attempts))) == sorted(map(repr, profiles))
+
+
+def test_hybrid_fetch_attempts_cancels_probes_when_closed_early(monkeypatch):
+    profiles = [{"Referer": "fast"}, {"Referer": "slow-1"}, {"Referer": "slow-2"}]
+    monkeypatch.setattr(fetch, "_HYBRID_HEADER_PROFILES", profiles)
+    monkeypatch.setattr(fetch, "HYBRID_MAX_WORKERS", 3)
+    slow_started = threading.Barrier(3)
+    cancelled = []
+
+    def fake_fetch(url, *, extra_headers, cancel, **_kwargs):
+        if extra_headers["Referer"] == "fast":
+            slow_started.wait(timeout=2)
+            return {"html": "fast", "final_url": url}
+        slow_started.wait(timeout=2)
+        cancelled.append(cancel.wait(timeout=2))
+        return {"html": "slow", "final_url": url}
+
+    monkeypatch.setattr(fetch, "fetch_with_resilience", fake_fetch)
+
+    attempts = fetch.hybrid_fetch_attempts("https://example.com/article")
+    _headers, result = next(attempts)
+    attempts.close()
+
+    deadline = time.monotonic() + 2
+    while len(cancelled) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert result["html"] == "fast"
+    assert cancelled == [True, True]
+
+
+def test_fetch_with_resilience_stops_retrying_once_cancelled():
+    cancel = threading.Event()
+    session = FakeSession([FakeResponse(status_code=503)] * 3)
+
+    result = fetch.fetch_with_resilience(
+        "https://example.com/article",
+        session=session,
+        sleep=lambda _wait: cancel.set(),
+        cancel=cancel,
+    )
+
+    assert result == {"error": "Fetch cancelled"}
+    assert len(session.calls) == 1
+
+
 def test_recover_truncated_content_prefers_archive_today():
     archive_utils._failure_cache.clear()
     truncated_text = "short"
@@ -214,7 +367,11 @@ def test_archive_recovery_caches_failure(monkeypatch):
 def test_archive_recovery_times_out(monkeypatch):
     archive_utils._failure_cache.clear()
     monkeypatch.setattr(archive_utils, "ARCHIVE_TIMEOUT_SECONDS", 0.02)
-    monkeypatch.setattr(archive_utils, "_should_skip_archive", lambda url: False)
+
+    async def never_skip(url):
+        return False
+
+    monkeypatch.setattr(archive_utils, "_should_skip_archive_async", never_skip)
 
     def slow_fetcher(url):
         time.sleep(0.05)
@@ -237,3 +394,256 @@ def test_archive_recovery_times_out(monkeypatch):
     # Ensure we respected the timeout budget (allowing for small scheduler overhead)
     assert duration < 0.2
     archive_utils._failure_cache.clear()
+
+
+def test_should_skip_archive_async_seeds_then_skips(monkeypatch):
+    archive_utils._failure_cache.clear()
+    url = "https://example.com/seeded"
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    lookups = []
+
+    def get():
+        lookups.append(url)
+        return SimpleNamespace(exists=True, to_dict=lambda: {"expiresAt": expires_at})
+
+    doc_ref = SimpleNamespace(get=get, delete=lambda: None)
+    fake_db = SimpleNamespace(
+        collection=lambda name: SimpleNamespace(document=lambda doc_id: doc_ref)
+    )
+    monkeypatch.setattr(archive_utils, "_db", fake_db)
+
+    # A Firestore hit seeds the local cache but still allows one revalidation.
+    assert asyncio.run(archive_utils._should_skip_archive_async(url)) is False
+    assert url in archive_utils._failure_cache
+    # Later checks are served from the local cache without touching Firestore.
+    assert asyncio.run(archive_utils._should_skip_archive_async(url)) is True
+    assert lookups == [url]
+    archive_utils._failure_cache.clear()
+
+
+def test_failure_cache_evicts_least_recently_used_and_expires(monkeypatch):
+    archive_utils._failure_cache.clear()
+    monkeypatch.setattr(archive_utils, "ARCHIVE_FAILURE_CACHE_SIZE", 2)
+
+    archive_utils._cache_failure("https://a.example")
+    archive_utils._cache_failure("https://b.example")
+    assert archive_utils._failure_cached("https://a.example") is True
+    archive_utils._cache_failure("https://c.example")
+
+    assert list(archive_utils._failure_cache) == [
+        "https://a.example",
+        "https://c.example",
+    ]
+
+    monkeypatch.setattr(archive_utils, "ARCHIVE_FAILURE_TTL_SECONDS", -1)
+    archive_utils._cache_failure("https://d.example")
+    assert archive_utils._failure_cached("https://d.example") is False
+    assert "https://d.example" not in archive_utils._failure_cache
+    archive_utils._failure_cache.clear()
+
+
+def test_archive_recovery_aborts_when_firestore_reports_skip(monkeypatch):
+    archive_utils._failure_cache.clear()
+    monkeypatch.setattr(archive_utils, "_db", SimpleNamespace())
+
+    async def skip(url):
+        return True
+
+    monkeypatch.setattr(archive_utils, "_should_skip_archive_async", skip)
+
+    def slow_fetcher(url):
+        time.sleep(0.05)
+        return {"error": "slow"}
+
+    result = archive_utils.recover_truncated_content(
+        "https://example.com/skip",
+        "short",
+        extractor=lambda html, origin_url, resolved_url: {"error": "unused"},
+        fetcher=slow_fetcher,
+        is_truncated=lambda _: True,
+    )
+
+    assert result is None
+    assert "https://example.com/skip" not in archive_utils._failure_cache
+
+
+def test_concurrent_recoveries_for_same_url_share_one_attempt():
+    archive_utils._failure_cache.clear()
+    archive_url = "https://archive.today/latest/https://example.com/shared"
+    fetched = []
+
+    def fetcher(url):
+        fetched.append(url)
+        time.sleep(0.05)
+        if url == archive_url:
+            return {
+                "html": "<html><body>Full article content</body></html>",
+                "final_url": "https://archive.today/shared",
+                "status_code": 200,
+            }
+        return {"error": "missing"}
+
+    def extractor(html, origin_url, resolved_url):
+        return {"text": "A" * 800, "source_url": origin_url}
+
+    async def scenario():
+        return await asyncio.gather(
+            *(
+                archive_utils.recover_truncated_content_async(
+                    "https://example.com/shared",
+                    "short",
+                    extractor=extractor,
+                    fetcher=fetcher,
+                    is_truncated=lambda text: len((text or "").strip()) < 500,
+                )
+                for _ in range(2)
+            )
+        )
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second
+    assert first is not second
+    assert fetched.count(archive_url) == 1
+    assert archive_utils._inflight_recoveries == {}
+
+
+def test_archive_admission_admits_waiters_when_limit_raised():
+    async def scenario():
+        admission = archive_utils.ArchiveAdmission(1)
+        entered = []
+
+        async def worker(name):
+            async with admission:
+                entered.append(name)
+                await asyncio.sleep(0.05)
+
+        first = asyncio.create_task(worker("first"))
+        second = asyncio.create_task(worker("second"))
+        await asyncio.sleep(0.01)
+        assert entered == ["first"]
+
+        await admission.set_limit(2)
+        await asyncio.sleep(0.01)
+        assert entered == ["first", "second"]
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+
+
+def test_failure_writes_are_committed_in_one_ordered_batch(monkeypatch):
+    archive_utils._failure_cache.clear()
+    operations = []
+    commits = []
+
+    class FakeBatch:
+        def set(self, doc_ref, payload, merge):
+            operations.append(("set", doc_ref, payload["reason"]))
+
+        def delete(self, doc_ref):
+            operations.append(("delete", doc_ref))
+
+        def commit(self):
+            commits.append(list(operations))
+
+    fake_db = SimpleNamespace(
+        batch=FakeBatch,
+        collection=lambda name: SimpleNamespace(document=lambda doc_id: doc_id),
+    )
+    monkeypatch.setattr(archive_utils, "_db", fake_db)
+    monkeypatch.setattr(archive_utils, "ARCHIVE_FAILURE_FLUSH_SECONDS", 0.01)
+    monkeypatch.setattr(archive_utils, "_failure_flusher", None)
+
+    async def scenario():
+        monkeypatch.setattr(archive_utils, "_failure_writes", asyncio.Queue())
+        archive_utils._record_failure("https://a.example", "timeout")
+        archive_utils._record_failure("https://b.example", "no_snapshot")
+        archive_utils._clear_failure("https://a.example")
+        await asyncio.sleep(0.1)
+        archive_utils._failure_flusher.cancel()
+
+    asyncio.run(scenario())
+
+    key_a = archive_utils._cache_key("https://a.example")
+    key_b = archive_utils._cache_key("https://b.example")
+    assert commits == [
+        [("set", key_a, "timeout"), ("set", key_b, "no_snapshot"), ("delete", key_a)]
+    ]
+    archive_utils._failure_cache.clear()
+
+
+def test_failure_writes_are_flushed_at_exit(monkeypatch):
+    archive_utils._failure_cache.clear()
+    committed = []
+
+    class FakeBatch:
+        def __init__(self):
+            self.operations = []
+
+        def set(self, doc_ref, payload, merge):
+            self.operations.append(doc_ref)
+
+        def delete(self, doc_ref):
+            self.operations.append(doc_ref)
+
+        def commit(self):
+            committed.extend(self.operations)
+
+    fake_db = SimpleNamespace(
+        batch=FakeBatch,
+        collection=lambda name: SimpleNamespace(document=lambda doc_id: doc_id),
+    )
+    monkeypatch.setattr(archive_utils, "_db", fake_db)
+    # Long enough that the flusher is still collecting when the process exits.
+    monkeypatch.setattr(archive_utils, "ARCHIVE_FAILURE_FLUSH_SECONDS", 60)
+    monkeypatch.setattr(archive_utils, "_failure_flusher", None)
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(archive_utils, "_loop", loop)
+
+    async def record():
+        monkeypatch.setattr(archive_utils, "_failure_writes", asyncio.Queue())
+        archive_utils._record_failure("https://a.example", "timeout")
+        archive_utils._record_failure("https://b.example", "timeout")
+
+    try:
+        asyncio.run_coroutine_threadsafe(record(), loop).result(timeout=1)
+        time.sleep(0.05)
+        archive_utils._flush_failure_writes_at_exit()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=1)
+
+    assert committed == [
+        archive_utils._cache_key("https://a.example"),
+        archive_utils._cache_key("https://b.example"),
+    ]
+    archive_utils._failure_cache.clear()
+
+
+def test_should_skip_archive_async_caches_clean_lookups(monkeypatch):
+    archive_utils._failure_cache.clear()
+    archive_utils._clean_cache.clear()
+    url = "https://example.com/fresh"
+    lookups = []
+
+    def get():
+        lookups.append(url)
+        return SimpleNamespace(exists=False, to_dict=lambda: None)
+
+    doc_ref = SimpleNamespace(get=get, delete=lambda: None)
+    fake_db = SimpleNamespace(
+        collection=lambda name: SimpleNamespace(document=lambda doc_id: doc_ref)
+    )
+    monkeypatch.setattr(archive_utils, "_db", fake_db)
+
+    assert asyncio.run(archive_utils._should_skip_archive_async(url)) is False
+    assert asyncio.run(archive_utils._should_skip_archive_async(url)) is False
+    assert lookups == [url]
+
+    # Recording a failure drops the clean marker.
+    archive_utils._cache_failure(url)
+    assert url not in archive_utils._clean_cache
+    archive_utils._failure_cache.clear()
@@ -3,6 +3,7 @@ from datetime import datetime, timezone, timedelta
 import hashlib
 from unittest.mock import patch
 import feedparser
+from feedgen.feed import FeedGenerator
 from xml.etree import ElementTree as ET
 from types import SimpleNamespace
 from google.api_core.exceptions import FailedPrecondition
@@ -180,6 +181,93 @@ def test_generate_feed_for_bucket(
     assert enclosure.type == "audio/mpeg"
 
 
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (None, ""),
+        ("  plain\n\ttext  ", "plain text"),
+        ("<p>Hello&nbsp;<b>world</b></p>", "Hello world"),
+        ("&lt;i&gt;escaped&lt;/i&gt; tags", "escaped tags"),
+        ("a <> b < c", "a <> b < c"),
+        ("unclosed <tag", "unclosed <tag"),
+    ],
+)
+def test_clean_text_strips_tags_and_collapses_whitespace(raw, expected):
+    assert feeds._clean_text(raw) == expected
+
+
+def test_bucket_lookup_rebuilt_only_when_bucket_list_changes(monkeypatch):
+    first = [SimpleNamespace(id="b1"), SimpleNamespace(id=None)]
+    current = {"buckets": first}
+    monkeypatch.setattr(feeds, "list_buckets", lambda: current["buckets"])
+    monkeypatch.setattr(feeds, "_bucket_lookup_memo", None)
+
+    lookup = feeds._get_bucket_lookup()
+    assert list(lookup) == ["b1"]
+    assert feeds._get_bucket_lookup() is lookup
+
+    current["buckets"] = [SimpleNamespace(id="b2")]
+    assert list(feeds._get_bucket_lookup()) == ["b2"]
+
+
+def test_invalidate_bucket_feed_deletes_all_pages_in_one_call(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        feeds,
+        "cache",
+        SimpleNamespace(delete_many=lambda *keys: calls.append(keys) or list(keys)),
+    )
+    monkeypatch.setattr(feeds, "FEED_CACHE_MAX_PAGES", 2)
+
+    feeds._invalidate_cached_bucket_feed("news")
+
+    assert calls == [
+        (
+            "feed_news_1",
+            "feed_news_2",
+            "feed_links_news_1",
+            "feed_links_news_2",
+            "feed_cursor_news_1",
+            "feed_cursor_news_2",
+        )
+    ]
+
+
+@patch("app.services.feeds.get_bucket_by_slug")
+@patch("app.services.feeds.list_items")
+@patch("app.services.feeds.list_buckets")
+def test_bucket_feed_resumes_from_cached_page_cursor(
+    mock_list_buckets, mock_list_items, mock_get_bucket_by_slug, monkeypatch
+):
+    bucket = Bucket(
+        id="bucket123",
+        name="Deep",
+        slug="deep",
+        description="Deep pages.",
+        rss_author_name="Tester",
+        rss_owner_email="test@example.com",
+    )
+    mock_get_bucket_by_slug.return_value = bucket
+    mock_list_buckets.return_value = [bucket]
+    mock_list_items.return_value = ([], "cursor-4")
+
+    stored = {"feed_cursor_deep_3": "cursor-3"}
+    monkeypatch.setattr(
+        feeds,
+        "cache",
+        SimpleNamespace(
+            get_many=lambda *keys: [stored.get(key) for key in keys],
+            set=lambda key, value, timeout=None: stored.__setitem__(key, value),
+        ),
+    )
+
+    feeds.generate_feed_for_bucket("deep", "https://example.com/feeds/deep.xml", 3)
+
+    assert mock_list_items.call_count == 1
+    assert mock_list_items.call_args.kwargs["cursor"] == "cursor-3"
+    assert stored["feed_cursor_deep_4"] == "cursor-4"
+
+
 def test_normalise_public_feed_filters_sanitises_inputs():
     filters = normalise_public_feed_filters(tag="  Science  ", days="730")
     assert filters == {"tag": "Science", "days": 365}
@@ -368,11 +456,39 @@ def test_generate_feed_keywords_and_image_selection(
     item_elements = channel.findall("item")
     assert len(item_elements) == 2
 
-    first_keywords = item_elements[0].findtext("itunes:keywords", default="", namespaces=ns)
-    second_keywords = item_elements[1].findtext("itunes:keywords", default="", namespaces=ns)
+    keywords_by_title = {
+        item.findtext("title"): item.findtext(
+            "itunes:keywords", default="", namespaces=ns
+        ).split(", ")
+        for item in item_elements
+    }
+    assert keywords_by_title == {
+        "Alpha Story": ["Audio Bucket", "alpha", "news"],
+        "Beta Story": ["Audio Bucket", "beta", "news"],
+    }
+
+
+def test_render_rss_keeps_keywords_on_their_own_items():
+    fg = FeedGenerator()
+    fg.load_extension("podcast")
+    fg.title("Keywords")
+    fg.link(href="https://example.com/feed.xml", rel="self")
+    fg.description("Per-item keyword alignment.")
+    for title in ("first", "second", "third"):
+        fe = fg.add_entry()
+        fe.title(title)
+        fe.guid(title, permalink=False)
+
+    rss = feeds._render_rss(fg, {"x", "z"}, [{"x"}, set(), {"z", "y"}])
 
-    assert first_keywords.split(", ") == ["Audio Bucket", "alpha", "news"]
-    assert second_keywords.split(", ") == ["Audio Bucket", "beta", "news"]
+    ns = {"itunes": "http://www.itunes.com/dtds/podcast-1.0.dtd"}
+    channel = ET.fromstring(rss).find("channel")
+    keywords_by_title = {
+        item.findtext("title"): item.findtext("itunes:keywords", namespaces=ns)
+        for item in channel.findall("item")
+    }
+    assert keywords_by_title == {"first": "x", "second": None, "third": "y, z"}
+    assert channel.findtext("itunes:keywords", namespaces=ns) == "x, z"
 
 
 @patch("app.services.feeds.get_bucket_by_slug")
@@ -424,3 +540,21 @@ def test_generate_feed_skips_invalid_episode_image(
     item_image = item_elem.find("itunes:image", namespaces=ns)
     assert item_image is not None
     assert item_image.attrib["href"] == fallback_url
+
+
+def test_bucket_feed_route_answers_matching_etag_with_not_modified(client):
+    feed_xml = b"<rss><channel><title>etag</title></channel></rss>"
+    with patch(
+        "app.routes.feeds.generate_feed_for_bucket", return_value=feed_xml
+    ):
+        first = client.get("/feeds/etag-bucket.xml")
+        etag = first.headers["ETag"]
+        second = client.get(
+            "/feeds/etag-bucket.xml", headers={"If-None-Match": etag}
+        )
+
+    assert first.status_code == 200
+    assert first.data == feed_xml
+    assert etag == f'"{hashlib.sha1(feed_xml).hexdigest()}"'
+    assert second.status_code == 304
+    assert second.data == b""
@@ -0,0 +1,44 @@
+from app.utils import ttl_cache as ttl_cache_module
+from app.utils.ttl_cache import ttl_cache
+
+
+def test_ttl_cache_memoises_until_cleared():
+    calls = []
+
+    @ttl_cache(maxsize=4, ttl=60)
+    def lookup(key, *, suffix=""):
+        calls.append((key, suffix))
+        return f"{key}{suffix}"
+
+    assert lookup("a") == "a"
+    assert lookup("a") == "a"
+    assert lookup("a", suffix="!") == "a!"
+    assert calls == [("a", ""), ("a", "!")]
+
+    lookup.cache.clear()
+    lookup("a")
+    assert calls[-1] == ("a", "")
+    assert len(calls) == 3
+
+
+def test_ttl_cache_expires_and_evicts_oldest(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ttl_cache_module.time, "monotonic", lambda: now[0])
+    calls = []
+
+    @ttl_cache(maxsize=2, ttl=10)
+    def lookup(key):
+        calls.append(key)
+        return key
+
+    lookup("a")
+    lookup("b")
+    lookup("c")
+    assert len(lookup.cache) == 2
+
+    lookup("a")
+    assert calls == ["a", "b", "c", "a"]
+
+    now[0] += 11
+    lookup("c")
+    assert calls[-1] == "c"